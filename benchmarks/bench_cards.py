@@ -0,0 +1,161 @@
+"""对比三种卡片在 Pillow 绘制与 HTML 截图两种后端下的耗时与内存。
+
+用法（在仓库根目录的上一级执行）：
+
+    python -m <插件目录名>.benchmarks.bench_cards [--rounds 20] [--font 字体路径]
+        [--browser auto|playwright|html2image|none]
+
+卡片数据取自 fixtures/ 的搜索页与详情页，封面为一张生成的纯色图片。Pillow
+后端记录单张耗时（中位数与 p95）和 tracemalloc 峰值（只统计 Python 堆，
+Pillow 的像素缓冲另计，约为宽×高×3 字节）；HTML 后端记录生成 HTML
+的耗时，截图部分通过 RendererPool 执行（未安装浏览器时记录错误信息，
+``--browser none`` 跳过截图）。不指定 ``--font`` 时自动查找系统中文字体。
+输出一行 JSON。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..src.cards import (
+    build_book_details_card_html,
+    build_search_card_html,
+    build_subscribe_update_card_html,
+)
+from ..src.core import parse_book_details_html_content, parse_search_html_content
+from ..src.raster import (
+    draw_book_details_card,
+    draw_search_card,
+    draw_subscribe_update_card,
+    find_cjk_font,
+)
+from ..src.renderer import RendererPool
+
+FIXTURES = Path(__file__).with_name("fixtures")
+
+
+def _cover_data_uri() -> str:
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (300, 420), (200, 110, 80)).save(buf, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+
+def _cards(cover: str) -> dict[str, tuple[Callable, Callable, tuple, dict]]:
+    search = parse_search_html_content(
+        (FIXTURES / "search_basic.html").read_text(encoding="utf-8")
+    )
+    details = parse_book_details_html_content(
+        (FIXTURES / "detail_basic.html").read_text(encoding="utf-8")
+    )
+    return {
+        "search": (
+            build_search_card_html,
+            draw_search_card,
+            (search,),
+            {"query": "剑", "max_items": 8, "total": len(search)},
+        ),
+        "details": (
+            build_book_details_card_html,
+            draw_book_details_card,
+            (details,),
+            {"cover_data_uri": cover},
+        ),
+        "update": (
+            build_subscribe_update_card_html,
+            draw_subscribe_update_card,
+            (details,),
+            {"book_id": 100123456, "cover_data_uri": cover},
+        ),
+    }
+
+
+def _timings(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+    }
+
+
+def _measure(func: Callable[[], Any], rounds: int) -> dict[str, float]:
+    func()  # 预热：字体加载与字形缓存
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {**_timings(samples), "peak_kib": round(peak / 1024, 1)}
+
+
+async def _screenshots(
+    cards: dict, browser: str, rounds: int, output_dir: Path
+) -> dict[str, Any]:
+    pool = RendererPool(1, browser=browser)
+    result: dict[str, Any] = {"backend": pool.backend}
+    try:
+        for kind, (build_html, _, args, kwargs) in cards.items():
+            card = build_html(*args, **kwargs)
+            samples = []
+            try:
+                await pool.render(card, output_dir=output_dir)
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    await pool.render(card, output_dir=output_dir)
+                    samples.append(time.perf_counter() - start)
+            except Exception as exc:
+                return {**result, "error": str(exc)}
+            result[kind] = _timings(samples)
+    finally:
+        await pool.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--font", default="")
+    parser.add_argument(
+        "--browser", default="auto", choices=("auto", "playwright", "html2image", "none")
+    )
+    args = parser.parse_args()
+
+    font = find_cjk_font(args.font)
+    cards = _cards(_cover_data_uri())
+    output_dir = Path(tempfile.mkdtemp(prefix="cwm_cards_"))
+    result: dict[str, Any] = {"rounds": args.rounds, "font": font, "pillow": {}, "html": {}}
+    for kind, (build_html, draw_png, card_args, kwargs) in cards.items():
+        result["pillow"][kind] = _measure(
+            lambda: draw_png(
+                *card_args, output_dir=output_dir, font_path=font, **kwargs
+            ),
+            args.rounds,
+        )
+        result["html"][kind] = _measure(
+            lambda: build_html(*card_args, **kwargs), args.rounds
+        )
+    if args.browser != "none":
+        result["screenshot"] = asyncio.run(
+            _screenshots(cards, args.browser, max(1, args.rounds // 4), output_dir)
+        )
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
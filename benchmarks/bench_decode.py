@@ -0,0 +1,65 @@
+"""对比整页字符集探测与按声明解码的耗时。
+
+用法（在仓库根目录的上一级执行，使插件目录可作为包导入）：
+
+    python -m <插件目录名>.benchmarks.bench_decode [--rounds N]
+
+输出一行 JSON，便于在不同机器间对比。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from ..src.core import decode_html_bytes
+
+FIXTURES = Path(__file__).with_name("fixtures")
+
+
+def _bench(func, body: bytes, rounds: int) -> dict[str, float]:
+    func(body)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(body)
+    total = time.perf_counter() - start
+    return {"total_s": round(total, 6), "per_page_us": round(total / rounds * 1e6, 2)}
+
+
+def _detect_decode(body: bytes) -> str:
+    from charset_normalizer import from_bytes
+
+    best = from_bytes(body).best()
+    return str(best) if best is not None else body.decode("utf-8", errors="replace")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--fixture", default="detail_basic.html")
+    args = parser.parse_args()
+
+    body = (FIXTURES / args.fixture).read_bytes()
+    result: dict[str, object] = {
+        "fixture": args.fixture,
+        "bytes": len(body),
+        "rounds": args.rounds,
+        "declared": _bench(decode_html_bytes, body, args.rounds),
+    }
+    try:
+        result["detect"] = _bench(_detect_decode, body, args.rounds)
+    except ImportError:
+        result["detect"] = None
+    else:
+        same = _detect_decode(body) == decode_html_bytes(body)
+        result["same_text"] = same
+        result["speedup"] = round(
+            result["detect"]["total_s"] / max(result["declared"]["total_s"], 1e-9), 1
+        )
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""对比线程池与进程池执行详情页解析时的吞吐与事件循环延迟。
+
+用法（在仓库根目录的上一级执行）：
+
+    python -m <插件目录名>.benchmarks.bench_offload [--pages 1000] [--workers 4] [--backend bs4]
+
+语料由 fixtures/detail_basic.html 变换书名、章节与简介生成，每页内容不同。
+输出一行 JSON。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from ..src.core import parse_book_details_html_content, set_default_parser_backend
+from ..src.offload import CpuOffloader
+
+FIXTURES = Path(__file__).with_name("fixtures")
+
+
+def build_corpus(pages: int) -> list[str]:
+    base = (FIXTURES / "detail_basic.html").read_text(encoding="utf-8")
+    corpus = []
+    for i in range(pages):
+        corpus.append(
+            base.replace("断剑问天", f"断剑问天{i}")
+            .replace("第三百二十一章", f"第{i}章")
+            .replace("第1段", f"第1段（{i}）")
+        )
+    return corpus
+
+
+async def _measure(offloader: CpuOffloader, corpus: list[str], concurrency: int):
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        # 事件循环每 10ms 醒一次，记录实际延迟
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(html: str) -> None:
+        async with sem:
+            await offloader.run(parse_book_details_html_content, html)
+
+    # 预热：进程池在首次调用时启动，不计入耗时
+    await asyncio.gather(*(one(html) for html in corpus[:concurrency]))
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(one(html) for html in corpus))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    lags.sort()
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_s": round(len(corpus) / elapsed, 1),
+        "loop_lag_p50_ms": round(lags[len(lags) // 2] * 1000, 2) if lags else 0.0,
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2) if lags else 0.0,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, object]:
+    corpus = build_corpus(args.pages)
+    backend = set_default_parser_backend(args.backend)
+    result: dict[str, object] = {
+        "pages": args.pages,
+        "workers": args.workers,
+        "backend": backend,
+        "cpus": os.cpu_count(),
+    }
+    thread = CpuOffloader(0)
+    result["thread"] = await _measure(thread, corpus, args.workers)
+    process = CpuOffloader(
+        args.workers, initializer=set_default_parser_backend, initargs=(backend,)
+    )
+    try:
+        result["process"] = await _measure(process, corpus, args.workers * 2)
+    finally:
+        process.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backend", default="auto")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
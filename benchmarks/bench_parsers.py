@@ -0,0 +1,167 @@
+"""解析函数与时间提取的基准测试：吞吐、内存分配与峰值内存。
+
+用法（在仓库根目录的上一级执行）：
+
+    python -m <插件目录名>.benchmarks.bench_parsers [--min-time 0.5]
+        [--output result.json] [--compare baseline.json] [--threshold 0.25]
+
+夹具页面位于 fixtures/：``search_*.html`` 按搜索页解析，``detail_*.html`` 按
+详情页解析，每个已安装的解析后端各跑一遍。结果为 JSON；指定 ``--compare`` 时
+与基线逐项比较，单页耗时或峰值内存超出阈值即列为回归并以非零状态退出。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..src.core import (
+    PARSER_BACKENDS,
+    cn_number_to_float,
+    count_search_items,
+    extract_chapter_info,
+    parse_book_details_html_content,
+    parse_search_html_content,
+    parse_search_items,
+)
+
+FIXTURES = Path(__file__).with_name("fixtures")
+
+UPDATE_TEXTS = [
+    "最近更新：第三百二十一章 剑起苍澜 / [2024-05-01 12:30:00]",
+    "最近更新：2024/05/01 12:30:00 | 第三百二十一章 剑起苍澜",
+    "更新时间：2024-05-01 12:30:00",
+    "最近更新：第一章 （无时间）",
+    "",
+]
+NUMBER_TEXTS = ["123.4万", "5.6亿", "1,234", "98765", "连载中", ""]
+# 与 /cwm 搜索 展示的条数一致
+SEARCH_SHOWN = 8
+
+
+def _measure(func: Callable[[], Any], min_time: float) -> dict[str, float]:
+    func()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    # 循环引用的垃圾不算驻留
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rounds = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or rounds < 3:
+        func()
+        rounds += 1
+        elapsed = time.perf_counter() - start
+    return {
+        "rounds": rounds,
+        "per_op_us": round(elapsed / rounds * 1e6, 2),
+        "ops_per_s": round(rounds / elapsed, 1),
+        "peak_kib": round((peak - base) / 1024, 1),
+        "retained_kib": round((current - base) / 1024, 1),
+    }
+
+
+def run(min_time: float) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        if path.name.startswith("search_"):
+            parse: Callable[..., Any] = parse_search_html_content
+        elif path.name.startswith("detail_"):
+            parse = parse_book_details_html_content
+        else:
+            continue
+        for backend in PARSER_BACKENDS:
+            key = f"{parse.__name__}:{path.stem}:{backend}"
+            results[key] = _measure(
+                lambda parse=parse, html=html, backend=backend: parse(
+                    html, backend=backend
+                ),
+                min_time,
+            )
+        if path.name.startswith("search_"):
+            for backend in PARSER_BACKENDS:
+                results[f"parse_search_items[{SEARCH_SHOWN}]:{path.stem}:{backend}"] = (
+                    _measure(
+                        lambda html=html, backend=backend: parse_search_items(
+                            html, limit=SEARCH_SHOWN, backend=backend
+                        ),
+                        min_time,
+                    )
+                )
+            results[f"count_search_items:{path.stem}"] = _measure(
+                lambda html=html: count_search_items(html), min_time
+            )
+
+    for i, text in enumerate(UPDATE_TEXTS):
+        results[f"extract_chapter_info:{i}"] = _measure(
+            lambda text=text: extract_chapter_info(text), min_time
+        )
+    results["cn_number_to_float:all"] = _measure(
+        lambda: [cn_number_to_float(text) for text in NUMBER_TEXTS], min_time
+    )
+    return results
+
+
+def compare(
+    baseline: dict[str, dict[str, float]],
+    current: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for key, now in current.items():
+        old = baseline.get(key)
+        if not old:
+            continue
+        for metric in ("per_op_us", "peak_kib"):
+            before, after = old.get(metric, 0), now.get(metric, 0)
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(f"{key} {metric}: {before} -> {after}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backends": list(PARSER_BACKENDS),
+        "results": run(args.min_time),
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(baseline["results"], report["results"], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""对比以嵌套字典与不可变记录保存大量书籍详情 / 订阅基线时的内存占用。
+
+用法（在仓库根目录的上一级执行）：
+
+    python -m <插件目录名>.benchmarks.bench_records [--books 10000]
+
+每本书由 fixtures/detail_basic.html 的解析结果变换书名、章节与时间戳生成，
+字符串各不相同，避免被驻留共享而低估字典的开销。输出一行 JSON。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..src.cache import approx_sizeof
+from ..src.core import BookDetails, BookMeta, parse_book_details
+
+FIXTURES = Path(__file__).with_name("fixtures")
+
+
+def _variant(base: BookDetails, i: int) -> BookDetails:
+    return BookDetails(
+        works_name=f"{base.works_name}{i}",
+        author_name=base.author_name,
+        tag_list=base.tag_list,
+        chapter_name=f"第{i}章",
+        update_time=base.update_time + i,
+        brief_introduction=base.brief_introduction,
+        cover_image=f"{base.cover_image}?v={i}",
+        properties=base.properties,
+        stats=base.stats,
+    )
+
+
+def _build_dicts(base: BookDetails, books: int) -> tuple[list, dict]:
+    details = [_variant(base, i).to_dict() for i in range(books)]
+    metas = {
+        i: {
+            "title_text": d["Works_Name"],
+            "timestamp": d["Update_Time"],
+            "chapter": d["Chapter_Name"],
+        }
+        for i, d in enumerate(details)
+    }
+    return details, metas
+
+
+def _build_records(base: BookDetails, books: int) -> tuple[list, dict]:
+    details = [_variant(base, i) for i in range(books)]
+    metas = {
+        i: BookMeta(d.works_name, d.update_time, d.chapter_name)
+        for i, d in enumerate(details)
+    }
+    return details, metas
+
+
+def _measure(build: Callable[[], Any]) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    details, metas = data
+    return {
+        "build_s": round(elapsed, 3),
+        "retained_kib": round(current / 1024, 1),
+        "peak_kib": round(peak / 1024, 1),
+        "approx_details_kib": round(approx_sizeof(details) / 1024, 1),
+        "approx_meta_kib": round(approx_sizeof(metas) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=10000)
+    args = parser.parse_args()
+
+    html = (FIXTURES / "detail_basic.html").read_text(encoding="utf-8")
+    base = parse_book_details(html)
+    if base is None:
+        raise SystemExit("detail_basic.html 解析失败")
+
+    dicts = _measure(lambda: _build_dicts(base, args.books))
+    records = _measure(lambda: _build_records(base, args.books))
+    print(
+        json.dumps(
+            {
+                "books": args.books,
+                "dict": dicts,
+                "records": records,
+                "retained_ratio": round(
+                    records["retained_kib"] / max(dicts["retained_kib"], 1e-9), 3
+                ),
+            },
+            ensure_ascii=False,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""校验各解析后端在夹具页面上的输出完全一致，并给出单页耗时。
+
+用法（在仓库根目录的上一级执行）：
+
+    python -m <插件目录名>.benchmarks.parity [--rounds N]
+
+文件名以 ``search_`` 开头的夹具按搜索页解析，其余按详情页解析。
+任一后端结果与 bs4 不同时打印差异并以非零状态退出。
+
+详情页夹具另外模拟轮询的流式读取：按块累积到 ``has_detail_head`` 成立为止，
+解析截断后的页面，书名、章节、更新时间与封面须与整页结果一致。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from ..src.core import (
+    PARSER_BACKENDS,
+    has_detail_head,
+    parse_book_details_html_content,
+    parse_search_html_content,
+)
+
+FIXTURES = Path(__file__).with_name("fixtures")
+STREAM_CHUNK = 512
+STREAM_FIELDS = ("Works_Name", "Chapter_Name", "Update_Time", "Cover_Image")
+
+
+def _parser_for(path: Path):
+    if path.name.startswith("search_"):
+        return parse_search_html_content
+    return parse_book_details_html_content
+
+
+def _stream_prefix(html: str) -> str | None:
+    """按块累积页面，返回 has_detail_head 首次成立时的前缀；需读完整页时返回 None"""
+    body = html.encode("utf-8")
+    for end in range(STREAM_CHUNK, len(body), STREAM_CHUNK):
+        if has_detail_head(body[:end]):
+            return body[:end].decode("utf-8", errors="ignore")
+    return None
+
+
+def _diff(expected, actual, path: str = "") -> list[str]:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        out: list[str] = []
+        for key in sorted(set(expected) | set(actual), key=str):
+            out += _diff(expected.get(key), actual.get(key), f"{path}.{key}")
+        return out
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: len {len(expected)} != {len(actual)}"]
+        out = []
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            out += _diff(a, b, f"{path}[{i}]")
+        return out
+    if expected == actual:
+        return []
+    if isinstance(expected, str) and isinstance(actual, str):
+        # 长文本只展示第一个不同之处附近的内容
+        pos = next(
+            (i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+            min(len(expected), len(actual)),
+        )
+        lo = max(0, pos - 20)
+        return [
+            f"{path}: first difference at {pos}: "
+            f"{expected[lo:pos + 40]!r} != {actual[lo:pos + 40]!r}"
+        ]
+    return [f"{path}: {expected!r} != {actual!r}"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    failures = 0
+    report: list[dict[str, object]] = []
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        parse = _parser_for(path)
+        expected = parse(html, backend="bs4")
+        row: dict[str, object] = {"fixture": path.name}
+        for name in PARSER_BACKENDS:
+            diffs = _diff(expected, parse(html, backend=name))
+            if diffs:
+                failures += 1
+                print(f"[{path.name}] {name} differs from bs4:", file=sys.stderr)
+                for line in diffs[:20]:
+                    print(f"  {line}", file=sys.stderr)
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                parse(html, backend=name)
+            per_page = (time.perf_counter() - start) / args.rounds
+            row[name] = {"same": not diffs, "per_page_us": round(per_page * 1e6, 1)}
+        prefix = None if path.name.startswith("search_") else _stream_prefix(html)
+        if prefix is not None:
+            partial = parse(prefix, backend="bs4")
+            diffs = _diff(
+                {key: expected.get(key) for key in STREAM_FIELDS},
+                {key: partial.get(key) for key in STREAM_FIELDS},
+            )
+            if diffs:
+                failures += 1
+                print(f"[{path.name}] streamed prefix differs:", file=sys.stderr)
+                for line in diffs:
+                    print(f"  {line}", file=sys.stderr)
+            row["stream"] = {"same": not diffs, "prefix_bytes": len(prefix.encode("utf-8"))}
+        report.append(row)
+
+    print(json.dumps(report, ensure_ascii=False))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""本地替身站点：用夹具页面模拟详情页、搜索页与章节目录，供更新检测联调。
+
+用法（在仓库根目录的上一级执行）：
+
+    python -m <插件目录名>.benchmarks.standin_server [--port 8765] [--chapters 300]
+    python -m <插件目录名>.benchmarks.standin_server --selftest
+
+把插件配置 ``base_url`` 设为 ``http://127.0.0.1:8765`` 即可让插件访问替身站点。
+``POST /_add/{book_id}?n=5`` 给该书追加 n 章，详情页的最近更新随之变化；
+章节目录支持 ``Range: bytes=-N`` 末尾请求。``--selftest`` 在随机端口启动
+服务，依次验证完整目录、末尾读取与末尾未命中回退，输出一行 JSON。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from aiohttp import web
+
+from ..src.catalog import ChapterIndex
+from ..src.core import AsyncCiweimaoClient, parse_chapter_catalog
+
+FIXTURES = Path(__file__).with_name("fixtures")
+FIRST_CHAPTER_ID = 100000001
+BASE_TIME = datetime(2024, 5, 1, 12, 30)
+
+
+class StandinSite:
+    def __init__(self, chapters: int):
+        self.initial_chapters = max(1, int(chapters))
+        self.books: dict[int, int] = {}
+        self.detail = (FIXTURES / "detail_basic.html").read_text(encoding="utf-8")
+        self.search = (FIXTURES / "search_basic.html").read_bytes()
+
+    def count(self, book_id: int) -> int:
+        return self.books.setdefault(book_id, self.initial_chapters)
+
+    @staticmethod
+    def title(n: int) -> str:
+        return f"第{n}章 替身章节{n}"
+
+    def catalog_html(self, book_id: int) -> bytes:
+        rows = "\n".join(
+            f'      <li><a href="https://www.ciweimao.com/chapter/{FIRST_CHAPTER_ID + n}"'
+            f' target="_blank"><i class="icon-lock"></i>{self.title(n)}</a></li>'
+            for n in range(1, self.count(book_id) + 1)
+        )
+        return (
+            '<!doctype html>\n<html><head><meta charset="utf-8"><title>目录</title>'
+            "</head><body>\n"
+            f'  <div class="book-chapter-box"><h4 class="sub-tit">正文卷</h4>\n'
+            f'    <ul class="book-chapter-list">\n{rows}\n    </ul>\n  </div>\n'
+            "</body></html>\n"
+        ).encode("utf-8")
+
+    def detail_html(self, book_id: int) -> bytes:
+        n = self.count(book_id)
+        ts = (BASE_TIME + timedelta(minutes=n)).strftime("%Y-%m-%d %H:%M:%S")
+        return self.detail.replace(
+            "最近更新：第三百二十一章 剑起苍澜 / [2024-05-01 12:30:00]",
+            f"最近更新：{self.title(n)} / [{ts}]",
+        ).encode("utf-8")
+
+    async def book(self, request: web.Request) -> web.Response:
+        book_id = int(request.match_info["book_id"])
+        etag = f'"{book_id}-{self.count(book_id)}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(
+            body=self.detail_html(book_id),
+            content_type="text/html",
+            charset="utf-8",
+            headers={"ETag": etag},
+        )
+
+    async def catalog(self, request: web.Request) -> web.Response:
+        body = self.catalog_html(int(request.match_info["book_id"]))
+        spec = request.headers.get("Range", "")
+        if spec.startswith("bytes=-") and spec[7:].isdigit():
+            size = min(len(body), int(spec[7:]))
+            start = len(body) - size
+            return web.Response(
+                status=206,
+                body=body[start:],
+                content_type="text/html",
+                charset="utf-8",
+                headers={"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"},
+            )
+        return web.Response(body=body, content_type="text/html", charset="utf-8")
+
+    async def search_page(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.search, content_type="text/html", charset="utf-8")
+
+    async def add(self, request: web.Request) -> web.Response:
+        book_id = int(request.match_info["book_id"])
+        self.books[book_id] = self.count(book_id) + int(request.query.get("n", "1"))
+        return web.json_response({"book_id": book_id, "chapters": self.books[book_id]})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/book/{book_id}", self.book)
+        app.router.add_get("/chapter-list/{book_id}/book_detail", self.catalog)
+        app.router.add_get("/get-search-book-list/{tail:.*}", self.search_page)
+        app.router.add_post("/_add/{book_id}", self.add)
+        return app
+
+
+async def selftest(chapters: int) -> dict[str, object]:
+    site = StandinSite(chapters)
+    runner = web.AppRunner(site.app())
+    await runner.setup()
+    tcp = web.TCPSite(runner, "127.0.0.1", 0)
+    await tcp.start()
+    port = runner.addresses[0][1]
+    client = AsyncCiweimaoClient(base_url=f"http://127.0.0.1:{port}", retries=0)
+    result: dict[str, object] = {"chapters": site.initial_chapters}
+    try:
+        full = await client.fetch_chapter_catalog(1)
+        baseline = parse_chapter_catalog(full.html)
+        index = ChapterIndex(c.chapter_id for c in baseline)
+        result["full"] = {"complete": full.complete, "parsed": len(baseline)}
+
+        site.books[1] += 5
+        tail = await client.fetch_chapter_catalog(1, tail_bytes=16 * 1024)
+        new = index.diff(parse_chapter_catalog(tail.html)) or []
+        result["tail"] = {
+            "complete": tail.complete,
+            "bytes": len(tail.html.encode("utf-8")),
+            "new": [c.title for c in new],
+        }
+        index.add(c.chapter_id for c in new)
+
+        # 一次新增的章节超出末尾读取范围：末尾找不到已知章节，需回退完整目录
+        site.books[1] += 500
+        tail = await client.fetch_chapter_catalog(1, tail_bytes=16 * 1024)
+        miss = index.diff(parse_chapter_catalog(tail.html))
+        full = await client.fetch_chapter_catalog(1)
+        new = index.diff(parse_chapter_catalog(full.html)) or []
+        result["tail_miss"] = {"tail_found": miss is not None, "new": len(new)}
+        result["ok"] = (
+            result["full"] == {"complete": True, "parsed": site.initial_chapters}
+            and result["tail"]["new"]
+            == [site.title(n) for n in range(site.initial_chapters + 1, site.initial_chapters + 6)]
+            and not tail.complete
+            and miss is None
+            and len(new) == 500
+        )
+        result["client"] = dict(client.catalog_stats)
+    finally:
+        await client.close()
+        await runner.cleanup()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--chapters", type=int, default=300)
+    parser.add_argument("--selftest", action="store_true")
+    args = parser.parse_args()
+    if args.selftest:
+        result = asyncio.run(selftest(args.chapters))
+        print(json.dumps(result, ensure_ascii=False))
+        return 0 if result["ok"] else 1
+    web.run_app(StandinSite(args.chapters).app(), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
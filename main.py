@@ -1,11 +1,16 @@
 import asyncio
+import collections
+import dataclasses
 import functools
+import itertools
 import json
 import re
+from collections.abc import Iterable, Sequence
 from datetime import datetime
 from pathlib import Path
 
 import aiofiles
+import aiometer
 
 import astrbot.api.message_components as Comp
 from astrbot.api import AstrBotConfig, logger
@@ -13,35 +18,158 @@ from astrbot.api.event import AstrMessageEvent, MessageChain, filter
 from astrbot.api.event.filter import PermissionType
 from astrbot.api.star import Context, Star, StarTools, register
 
+from .src.cache import CoverCache, SingleFlight, TTLCache
+from .src.catalog import ChapterIndex, chapters_after_title
 from .src.cards import (
-    render_book_details_card,
-    render_search_card,
-    render_subscribe_update_card,
+    CARD_TEMPLATE_VERSION,
+    build_book_details_card_html,
+    build_search_card_html,
+    build_subscribe_update_card_html,
 )
 from .src.core import (
-    CiweimaoClient,
+    AsyncCiweimaoClient,
+    BlockedPageError,
+    BookDetails,
+    BookMeta,
+    ChapterEntry,
+    SearchItem,
+    classify_page,
+    count_search_items,
     format_ts_cn,
-    parse_book_details_html_content,
-    parse_search_html_content,
+    parse_book_details,
+    parse_chapter_catalog,
+    parse_search_items,
+    probe_book_update,
+    set_default_parser_backend,
 )
+from .src.offload import CpuOffloader
+from .src.raster import (
+    CARD_BACKENDS,
+    RASTER_TEMPLATE_VERSION,
+    draw_book_details_card,
+    draw_search_card,
+    draw_subscribe_update_card,
+    find_cjk_font,
+    pillow_available,
+)
+from .src.renderer import RenderBusyError, RendererPool, RenderScheduler
+from .src.renders import RENDER_KINDS, RenderCache, RenderStore
+from .src.throttle import RateLimiter
 
 CWM_SUBSCRIBE_DEBUG = False  # 订阅相关 debug 日志开关（默认关闭）
+CWM_RENDER_DEBUG = False  # 卡片渲染 / 渲染缓存 debug 日志开关（默认关闭）
+MAX_LISTED_CHAPTERS = 30  # 更新提醒中最多列出的新增章节数
 
 
 @register("Getcwm", "lishining", "刺猬猫小说数据获取与画图插件", "3.0.0")
 class GetcwmPlugin(Star):
     def __init__(self, context: Context, config: AstrBotConfig):
         super().__init__(context)
-        self._cwm_client = CiweimaoClient()
         data_dir = Path(StarTools.get_data_dir())
+        self._cwm_client = AsyncCiweimaoClient(
+            pool_size=config.get("http_pool_size", 10),
+            pool_per_host=config.get("http_pool_per_host", 4),
+            limiter=RateLimiter(
+                {
+                    "search": float(config.get("rate_search_per_s", 1)),
+                    "details": float(config.get("rate_details_per_s", 3)),
+                    "cover": float(config.get("rate_cover_per_s", 5)),
+                },
+                global_rate=float(config.get("rate_global_per_s", 5)),
+            ),
+            retries=config.get("http_retries", 2),
+            breaker_threshold=config.get("breaker_threshold", 5),
+            breaker_cooldown_s=config.get("breaker_cooldown_s", 60),
+            cover_cache=CoverCache(
+                data_dir / "covers",
+                max_bytes=int(config.get("cover_cache_max_mib", 64)) * 1024 * 1024,
+                revalidate_s=float(config.get("cover_revalidate_hours", 24)) * 3600,
+            ),
+            base_url=config.get("base_url", "") or "https://www.ciweimao.com",
+        )
         self._render_dir = data_dir / "renders"
+        self._renderer = RendererPool(
+            config.get("render_pool_size", 1),
+            browser=config.get("render_browser", "auto"),
+            recycle_after=config.get("render_recycle_after", 200),
+        )
+        self._card_font = find_cjk_font(config.get("card_font_path", "") or "")
+        self._card_backends = {
+            kind: self._resolve_card_backend(
+                kind, config.get(f"{kind}_card_backend", "html")
+            )
+            for kind in ("search", "details", "update")
+        }
+        render_concurrency = int(config.get("render_concurrency", 1))
+        if "html" in self._card_backends.values():
+            # 超出截图池大小的渲染只会在池内排队，并让等待估算把排队时间算作渲染耗时
+            render_concurrency = min(render_concurrency, self._renderer.size)
+        self._render_scheduler = RenderScheduler(
+            render_concurrency,
+            max_wait_s=float(config.get("render_queue_max_wait_s", 8)),
+            max_depth=config.get("render_queue_max_depth", 10),
+        )
+        self._render_store = RenderStore(
+            self._render_dir,
+            max_bytes=int(float(config.get("render_max_mib", 256) or 0) * 1024 * 1024),
+            max_age_s=float(config.get("render_max_age_hours", 24) or 0) * 3600,
+            quotas={
+                kind: int(
+                    float(config.get(f"render_quota_{kind}_mib", 0) or 0) * 1024 * 1024
+                )
+                for kind in RENDER_KINDS
+            },
+        )
+        self._render_sweep_interval_s = max(
+            10.0, float(config.get("render_sweep_interval_s", 300))
+        )
+        self._render_sweep_task: asyncio.Task | None = None
+        render_cache_max_mib = float(config.get("render_cache_max_mib", 64) or 0)
+        self._render_cache = (
+            RenderCache(
+                self._render_store,
+                max_bytes=int(render_cache_max_mib * 1024 * 1024),
+            )
+            if render_cache_max_mib > 0
+            else None
+        )
         self._max_search_items = 8
         self.interval_time = config.get("interval_time", 20)
+        self._check_max_at_once = max(1, int(config.get("check_max_at_once", 4)))
+        self._poll_streaming = bool(config.get("poll_streaming", True))
+        self._catalog_tracking = bool(config.get("catalog_tracking", True))
+        self._catalog_tail_bytes = max(0, int(config.get("catalog_tail_kib", 16))) * 1024
+        self._parser_backend = set_default_parser_backend(
+            config.get("parser_backend", "auto")
+        )
+        # 工作进程需要与主进程使用相同的解析后端
+        self._cpu = CpuOffloader(
+            config.get("cpu_workers", 0),
+            initializer=set_default_parser_backend,
+            initargs=(self._parser_backend,),
+        )
+        check_max_per_second = float(config.get("check_max_per_second", 2) or 0)
+        self._check_max_per_second = (
+            check_max_per_second if check_max_per_second > 0 else None
+        )
         self.subscribe_data_file = data_dir / "subscribe.json"
         self.b2u: dict[int, list[str]] = {}
         self.u2b: dict[str, list[int]] = {}
-        self.bmeta: dict[int, dict] = {}
+        self.bmeta: dict[int, BookMeta] = {}
+        # 每本订阅书籍已推送过的章节 ID，用于计算两次检测之间新增的全部章节
+        self.chapter_index: dict[int, ChapterIndex] = {}
+        self._catalog_stats = {"diffs": 0, "tail_miss": 0, "new_chapters": 0}
         self._subscribe_lock = asyncio.Lock()
+        self._flights = SingleFlight()
+        self._probe_stats = {"probed": 0, "skipped": 0, "fallback": 0}
+        # 每本订阅书籍上次轮询页面的哈希，只保留当前订阅的书籍
+        self._page_digests: dict[int, str] = {}
+        self._last_check_counts: dict[str, int] = {}
+        self._details_cache: TTLCache[BookDetails] = TTLCache(
+            ttl_s=config.get("details_cache_ttl_s", 120),
+            max_entries=config.get("details_cache_max_entries", 512),
+            max_bytes=int(config.get("details_cache_max_kib", 4096)) * 1024,
+        )
 
         # 订阅任务相关
         self.subscribe_task: asyncio.Task | None = None
@@ -55,46 +183,53 @@ class GetcwmPlugin(Star):
             return default
 
     def _build_book_meta(
-        self, book_id: int, details: dict | None, fallback_meta: dict | None = None
-    ) -> dict:
-        data = details if isinstance(details, dict) else {}
-        base_meta = fallback_meta if isinstance(fallback_meta, dict) else {}
-        return {
-            "title_text": str(
-                data.get("Works_Name")
-                or base_meta.get("title_text")
+        self,
+        book_id: int,
+        details: BookDetails | None,
+        fallback_meta: BookMeta | None = None,
+    ) -> BookMeta:
+        # 解析结果缺失的字段沿用旧基线
+        return BookMeta(
+            title_text=(
+                (details.works_name if details else "")
+                or (fallback_meta.title_text if fallback_meta else "")
                 or f"书籍ID：{int(book_id)}"
             ),
-            "timestamp": self._safe_int(
-                data.get("Update_Time"), self._safe_int(base_meta.get("timestamp"))
+            timestamp=(
+                details.update_time
+                if details
+                else (fallback_meta.timestamp if fallback_meta else -1)
             ),
-            "chapter": str(data.get("Chapter_Name") or base_meta.get("chapter") or ""),
-        }
+            chapter=(
+                (details.chapter_name if details else "")
+                or (fallback_meta.chapter if fallback_meta else "")
+            ),
+        )
+
+    @staticmethod
+    def _apply_meta_to_details(
+        details: BookDetails | None, meta: BookMeta
+    ) -> BookDetails:
+        details = details or BookDetails(works_name=meta.title_text)
+        return dataclasses.replace(
+            details,
+            chapter_name=details.chapter_name or meta.chapter,
+            update_time=(
+                details.update_time if details.update_time > 0 else meta.timestamp
+            ),
+        )
 
-    def _apply_meta_to_details(self, details: dict | None, meta: dict) -> dict:
-        merged = dict(details) if isinstance(details, dict) else {}
-        merged.setdefault("Works_Name", meta["title_text"])
-        if meta["chapter"] and not merged.get("Chapter_Name"):
-            merged["Chapter_Name"] = meta["chapter"]
-        if meta["timestamp"] > 0 and self._safe_int(merged.get("Update_Time")) <= 0:
-            merged["Update_Time"] = meta["timestamp"]
-        return merged
-
-    async def _update_book_meta_if_newer(self, book_id: int, meta: dict) -> bool:
-        meta_ts = self._safe_int(meta.get("timestamp"))
-        if meta_ts <= 0:
+    async def _update_book_meta_if_newer(self, book_id: int, meta: BookMeta) -> bool:
+        if meta.timestamp <= 0:
             return False
-        normalized_meta = dict(meta)
-        normalized_meta["timestamp"] = meta_ts
 
         async with self._subscribe_lock:
-            current_meta = dict(self.bmeta.get(int(book_id), {}) or {})
-            current_ts = self._safe_int(current_meta.get("timestamp"))
-            if current_ts > 0 and meta_ts < current_ts:
+            current_meta = self.bmeta.get(int(book_id))
+            if current_meta is not None and meta.timestamp < current_meta.timestamp:
                 return False
-            if current_meta == normalized_meta:
+            if current_meta == meta:
                 return False
-            self.bmeta[int(book_id)] = normalized_meta
+            self.bmeta[int(book_id)] = meta
             return True
 
     # cwm 指令
@@ -114,6 +249,7 @@ class GetcwmPlugin(Star):
             "/cwm 取消订阅 [书籍id] [会话umo=当前会话]  取消会话对该书的订阅（指定其他会话需管理员）",
             "/cwm 全部订阅                      展示所有订阅(管理员)",
             "/cwm 测试推送                      强制向当前会话推送订阅更新(管理员,用于测试)",
+            "/cwm 运行状态                      查看请求与缓存统计(管理员)",
         ]
         yield event.plain_result("\n".join(help_text))
 
@@ -127,25 +263,26 @@ class GetcwmPlugin(Star):
                 return
 
             page = max(1, int(page))
-            html = await self._run_sync(self._cwm_client.search_name, query, page)
-            items = parse_search_html_content(html)
+            total, items = await self._load_search(query, page)
 
             if not items:
                 yield event.plain_result("未找到相关书籍")
                 return
 
             async def gen_img():
-                return await self._run_sync(
-                    render_search_card,
-                    items,
+                return await self._render_card(
+                    "search",
+                    build_search_card_html,
+                    draw_search_card,
+                    [item.to_dict() for item in items],
                     query=query,
                     max_items=self._max_search_items,
-                    output_dir=self._render_dir,
+                    total=total,
                 )
 
             def gen_text():
                 return self._format_search_text(
-                    items, query=query, max_items=self._max_search_items
+                    items, total=total, query=query, max_items=self._max_search_items
                 )
 
             async for result in self._generate_image_or_fallback(
@@ -162,19 +299,22 @@ class GetcwmPlugin(Star):
         """/cwm 名片 [书籍id]，获取小说名片"""
         try:
             bid = int(book_id)
-            html = await self._run_sync(self._cwm_client.get_book_details, bid)
-            data = parse_book_details_html_content(html) or {}
+            data = await self._load_book_details(bid)
 
             if not data:
                 yield event.plain_result("未能获取到书籍信息")
                 return
 
             async def gen_img():
-                return await self._run_sync(
-                    render_book_details_card,
-                    data,
-                    output_dir=self._render_dir,
-                    session=self._cwm_client.session,
+                cover_data_uri = await self._cwm_client.fetch_image_data_uri(
+                    data.cover_image
+                )
+                return await self._render_card(
+                    "details",
+                    build_book_details_card_html,
+                    draw_book_details_card,
+                    data.to_dict(),
+                    cover_data_uri=cover_data_uri or "",
                 )
 
             def gen_text():
@@ -224,6 +364,12 @@ class GetcwmPlugin(Star):
         msg = await self._get_all_subscribe_pairs_text()
         yield event.plain_result(msg)
 
+    @cwm.command("运行状态")
+    @filter.permission_type(PermissionType.ADMIN)
+    async def runtime_status(self, event: AstrMessageEvent):
+        """/cwm 运行状态，查看请求与缓存统计（管理员）"""
+        yield event.plain_result(self._get_runtime_status_text())
+
     # 工具函数
     @cwm.command("测试推送")
     @filter.permission_type(PermissionType.ADMIN)
@@ -282,11 +428,10 @@ class GetcwmPlugin(Star):
                 "[cwm][test_push] run_id=%s fetch details. book_id=%s", run_id, bid
             )
 
-            details: dict = {}
+            details: BookDetails | None = None
             fetch_ok = False
             try:
-                html = await self._run_sync(self._cwm_client.get_book_details, int(bid))
-                details = parse_book_details_html_content(html) or {}
+                details = await self._load_book_details(int(bid))
                 fetch_ok = True
             except Exception as e:
                 fetch_failed += 1
@@ -296,10 +441,10 @@ class GetcwmPlugin(Star):
                     bid,
                     e,
                 )
-                details = {}
+                details = None
 
             async with self._subscribe_lock:
-                old_meta = dict(self.bmeta.get(int(bid), {}) or {})
+                old_meta = self.bmeta.get(int(bid))
 
             new_meta = self._build_book_meta(bid, details, old_meta)
             details = self._apply_meta_to_details(details, new_meta)
@@ -314,15 +459,15 @@ class GetcwmPlugin(Star):
                 run_id,
                 bid,
                 fetch_ok,
-                new_meta["title_text"],
-                new_meta["chapter"],
-                new_meta["timestamp"],
+                new_meta.title_text,
+                new_meta.chapter,
+                new_meta.timestamp,
             )
 
             # treat scraped data as a new chapter and ALWAYS push to current session
             try:
                 res = await self._push_update(
-                    int(bid), details, [target_umo], old_meta=old_meta or None
+                    int(bid), details, [target_umo], old_meta=old_meta
                 )
                 pushed += 1
                 ok = int(res.get("ok", 0) or 0)
@@ -418,10 +563,8 @@ class GetcwmPlugin(Star):
                 added_book = True
 
             meta_updated = False
-            if latest_meta and (
-                bid not in self.bmeta
-                or int(self.bmeta.get(bid, {}).get("timestamp", -1) or -1) <= 0
-            ):
+            current_meta = self.bmeta.get(bid)
+            if current_meta is None or current_meta.timestamp <= 0:
                 self.bmeta[bid] = latest_meta
                 meta_updated = True
 
@@ -448,12 +591,7 @@ class GetcwmPlugin(Star):
         CWM_SUBSCRIBE_DEBUG and logger.debug("[cwm] 确保定时任务运行中")
         await self.start_subscribe_task()
 
-        title = (
-            (latest_meta or {}).get("title_text")
-            if isinstance(latest_meta, dict)
-            else None
-        )
-        title_str = str(title).strip() if title else f"书籍ID：{bid}"
+        title_str = latest_meta.title_text.strip() or f"书籍ID：{bid}"
         return f"订阅成功：{title_str}\n检测间隔：{int(self.interval_time)} 分钟"
 
     async def _get_subscribe_list_text(
@@ -476,9 +614,8 @@ class GetcwmPlugin(Star):
 
         async with self._subscribe_lock:
             book_ids = list(self.u2b.get(target_umo, []) or [])
-            metas = {
-                int(bid): dict(self.bmeta.get(int(bid), {}) or {}) for bid in book_ids
-            }
+            # BookMeta 不可变，直接引用即可
+            metas = {int(bid): self.bmeta.get(int(bid)) for bid in book_ids}
 
         if not book_ids:
             CWM_SUBSCRIBE_DEBUG and logger.debug(
@@ -519,15 +656,10 @@ class GetcwmPlugin(Star):
             lines.append(f"（订阅过多，仅展示前 {max_show} 本）")
 
         for idx, bid in enumerate(shown_ids, start=1):
-            meta = metas.get(int(bid), {}) or {}
-            title = (
-                str(meta.get("title_text", "") or "").strip() or f"书籍ID：{int(bid)}"
-            )
-            chapter = str(meta.get("chapter", "") or "").strip()
-            try:
-                ts = int(meta.get("timestamp", -1) or -1)
-            except Exception:
-                ts = -1
+            meta = metas.get(int(bid)) or BookMeta()
+            title = meta.title_text.strip() or f"书籍ID：{int(bid)}"
+            chapter = meta.chapter.strip()
+            ts = meta.timestamp
 
             lines.append(f"\n{idx}. {title}")
             lines.append(f"   ID：{int(bid)}")
@@ -575,12 +707,12 @@ class GetcwmPlugin(Star):
         after_book_subscribers = 0
         before_session_books = 0
         after_session_books = 0
-        meta_snapshot = None
+        meta_snapshot: BookMeta | None = None
         should_stop_task = False
         remaining_subscribed_books = 0
 
         async with self._subscribe_lock:
-            meta_snapshot = dict(self.bmeta.get(bid, {}) or {})
+            meta_snapshot = self.bmeta.get(bid)
 
             subs = self.b2u.get(bid, []) or []
             before_book_subscribers = len(subs)
@@ -595,6 +727,7 @@ class GetcwmPlugin(Star):
             else:
                 self.b2u.pop(bid, None)
                 self.bmeta.pop(bid, None)
+                self.chapter_index.pop(bid, None)
             after_book_subscribers = len(self.b2u.get(bid, []) or [])
 
             books = self.u2b.get(target_umo, []) or []
@@ -656,7 +789,7 @@ class GetcwmPlugin(Star):
             )
             await self.start_subscribe_task()
 
-        title = str((meta_snapshot or {}).get("title_text") or "").strip()
+        title = meta_snapshot.title_text.strip() if meta_snapshot else ""
         title_str = title if title else f"书籍ID：{bid}"
         session_suffix = "" if target_umo == current_umo else f"（会话：{target_umo}）"
         extra = "（已无任何订阅，订阅检测任务已停止）" if should_stop_task else ""
@@ -696,21 +829,274 @@ class GetcwmPlugin(Star):
         )
         return out
 
-    async def _fetch_latest_meta(self, book_id: int) -> dict | None:
+    async def _fetch_and_parse_details(self, book_id: int) -> BookDetails | None:
+        html = await self._cwm_client.get_book_details(int(book_id))
+        details = await self._run_cpu(parse_book_details, html)
+        if details is None or details.update_time <= 0:
+            # 只在解析不出详情时才判断页面类型，指令路径只记录不拦截
+            kind = classify_page(html)
+            if kind != "ok":
+                logger.warning(f"[cwm] 书籍详情：站点疑似返回 {kind} 页面 book_id={book_id}")
+        return details
+
+    def _drop_stale_cached_details(
+        self, book_id: int, update_time: int, chapter: str
+    ) -> None:
+        cached = self._details_cache.peek(book_id)
+        if cached is not None and (
+            cached.update_time != update_time or cached.chapter_name != chapter
+        ):
+            self._details_cache.pop(book_id)
+
+    async def _poll_and_parse_details(
+        self, book_id: int
+    ) -> tuple[str, BookDetails | None]:
+        """返回 ("not_modified", None) / ("identical", None) / ("unchanged", None) /
+        ("ok", details)
+        """
+        bid = int(book_id)
+        page = await self._cwm_client.poll_book_details(
+            bid, stream=self._poll_streaming
+        )
+        if page is None:
+            return "not_modified", None
+        if page.digest and self._page_digests.get(bid) == page.digest:
+            # 与上次轮询逐字节相同：上次的解析与比对结果仍然有效
+            if page.complete:
+                cached = self._details_cache.peek(bid)
+                if cached is not None:
+                    self._details_cache.put(bid, cached)
+            self._cwm_client.remember_validators(page)
+            return "identical", None
+        if page.kind != "ok":
+            # 验证页 / 不存在页面不解析，也不保存校验值作为条件请求的基准
+            self._page_digests.pop(bid, None)
+            raise BlockedPageError(bid, page.kind)
+
+        probe = probe_book_update(page.html)
+        if probe is None:
+            self._probe_stats["fallback"] += 1
+        else:
+            self._probe_stats["probed"] += 1
+            meta = self.bmeta.get(bid)
+            if (
+                meta is not None
+                and meta.timestamp == probe.update_time
+                and meta.chapter == probe.chapter
+            ):
+                # 与已记录的基线一致，无需完整解析
+                self._probe_stats["skipped"] += 1
+                self._drop_stale_cached_details(bid, probe.update_time, probe.chapter)
+                self._page_digests[bid] = page.digest
+                self._cwm_client.remember_validators(page)
+                return "unchanged", None
+
+        # 校验值只在解析成功后保存：解析抛错时下次轮询仍完整请求，不会被 304 掩盖
+        details = await self._run_cpu(parse_book_details, page.html)
+        if details is None or details.update_time <= 0:
+            # 无效页面不能作为条件请求的基准
+            self._page_digests.pop(bid, None)
+            return "ok", details
+        # 相同页面的比对结果不变，下次直接跳过
+        self._page_digests[bid] = page.digest
+        self._cwm_client.remember_validators(page)
+        if page.complete:
+            # 更新检测总是绕过缓存，并用最新结果刷新缓存
+            self._details_cache.put(bid, details)
+        else:
+            # 流式读取只拿到页面前部，不能写入缓存；已过时的缓存直接丢弃
+            self._drop_stale_cached_details(
+                bid, details.update_time, details.chapter_name
+            )
+        return "ok", details
+
+    async def _load_book_details(self, book_id: int) -> BookDetails | None:
+        """获取并解析书籍详情：优先读缓存，相同书籍的并发请求共享同一次抓取"""
+        bid = int(book_id)
+        cached = self._details_cache.get(bid)
+        if cached is not None:
+            return cached
+        poll = self._flights.inflight(("poll", bid))
+        if poll is not None:
+            # 更新检测正在抓取该书，完整读取时结果会写入缓存，等它结束再查一次
+            try:
+                await asyncio.shield(poll)
+            except Exception:
+                pass
+            cached = self._details_cache.get(bid)
+            if cached is not None:
+                return cached
+        details = await self._flights.do(
+            ("details", bid), functools.partial(self._fetch_and_parse_details, bid)
+        )
+        if details:
+            self._details_cache.put(bid, details)
+        return details
+
+    async def _load_search(
+        self, query: str, page: int
+    ) -> tuple[int, list[SearchItem]]:
+        """搜索并解析结果，相同关键词与页码的并发请求共享同一次抓取。
+
+        只提取要展示的前 ``_max_search_items`` 条，总条数由标签计数得出。
+        """
+
+        async def fetch() -> tuple[int, list[SearchItem]]:
+            html = await self._cwm_client.search_name(query, page)
+            items = await self._run_cpu(
+                parse_search_items, html, limit=self._max_search_items
+            )
+            return count_search_items(html), items
+
+        return await self._flights.do(("search", query, int(page)), fetch)
+
+    def _get_runtime_status_text(self) -> str:
+        cond = self._cwm_client.conditional_stats
+        lines = [
+            "Getcwm 运行状态",
+            (
+                f"条件请求：{cond['requests']} 次，304 命中 {cond['not_modified']} 次"
+                f"（{self._cwm_client.conditional_hit_rate():.1%}），"
+                f"节省约 {cond['bytes_saved'] / 1024:.1f} KiB"
+            ),
+            (
+                f"请求合并：调用 {self._flights.stats['calls']} 次，"
+                f"共享在途结果 {self._flights.stats['shared']} 次"
+            ),
+            self._format_cache_stats("详情缓存", self._details_cache),
+            f"解析后端：{self._parser_backend}",
+            (
+                f"CPU 任务：进程池 {self._cpu.stats['process']} 次"
+                f"（{self._cpu.workers} 进程{'，已启动' if self._cpu.started else ''}），"
+                f"线程池 {self._cpu.stats['thread']} 次"
+            ),
+        ]
+        last = self._last_check_counts
+        if last:
+            lines.append(
+                f"上次检测：{last['books']} 本，304 {last.get('not_modified', 0)}，"
+                f"页面相同 {last.get('identical', 0)}，探测无变化 {last.get('unchanged', 0)}，"
+                f"完整解析 {last.get('ok', 0)}，拦截 {last.get('blocked', 0)}，"
+                f"失败 {last.get('failed', 0)}"
+            )
+        probe = self._probe_stats
+        if probe["probed"] or probe["fallback"]:
+            lines.append(
+                f"更新探测：{probe['probed']} 次，跳过完整解析 {probe['skipped']} 次，"
+                f"缺少标记回退 {probe['fallback']} 次"
+            )
+        render = self._renderer.stats
+        lines.append(
+            f"卡片渲染：{self._renderer.backend}"
+            f"（{self._renderer.size} 并发，预热页面 {self._renderer.warm_pages}），"
+            f"渲染 {render['renders']} 次，失败 {render['failures']} 次，"
+            f"回收 {render['recycled']} 次，异常重建 {render['unhealthy']} 次，"
+            f"浏览器启动 {render['launches']} 次"
+        )
+        backends = self._card_backends
+        lines.append(
+            f"卡片后端：搜索 {backends['search']}，名片 {backends['details']}，"
+            f"更新 {backends['update']}"
+            + (f"（字体 {Path(self._card_font).name}）" if self._card_font else "")
+        )
+        sched = self._render_scheduler
+        lane_text = []
+        for lane, label in (("interactive", "指令"), ("background", "推送")):
+            ls = sched.stats[lane]
+            avg_wait = ls["wait_s"] / ls["renders"] if ls["renders"] else 0.0
+            lane_text.append(
+                f"{label}排队 {sched.depth(lane)}，已渲染 {ls['renders']}，"
+                f"平均等待 {avg_wait * 1000:.0f} ms，最长 {ls['max_wait_s'] * 1000:.0f} ms"
+            )
+        lines.append(
+            f"渲染队列：进行中 {sched.active}/{sched.concurrency}，"
+            + "；".join(lane_text)
+            + f"；排队过长改用文本 {sched.stats['interactive']['rejected']} 次，"
+            f"单张耗时约 {sched.avg_render_s * 1000:.0f} ms"
+        )
+        store = self._render_store
+        rs = store.stats
+        lines.append(
+            f"renders 目录：{len(store)} 张 / {store.total_bytes / 1024 / 1024:.1f} MiB（"
+            + "，".join(
+                f"{kind} {store.kind_bytes(kind) / 1024 / 1024:.1f}"
+                for kind in RENDER_KINDS
+            )
+            + f"），过期删除 {rs['expired']}，超限淘汰 {rs['evicted']}，"
+            f"发送中跳过 {rs['pinned_skips']}，清理 {rs['sweeps']} 轮"
+        )
+        render_cache = self._render_cache
+        if render_cache is not None:
+            rc = render_cache.stats
+            lines.append(
+                f"渲染缓存：{len(render_cache)} 张 / "
+                f"{render_cache.total_bytes / 1024 / 1024:.1f} MiB，"
+                f"命中 {rc['hits']}，未命中 {rc['misses']}"
+                f"（命中率 {render_cache.hit_rate():.1%}），"
+                f"写入 {rc['stores']}，淘汰 {rc['evictions']}"
+            )
+        catalog = self._cwm_client.catalog_stats
+        if catalog["requests"]:
+            lines.append(
+                f"章节目录：{catalog['requests']} 次（只读末尾 {catalog['tail']} 次，"
+                f"末尾未命中 {self._catalog_stats['tail_miss']} 次），"
+                f"共读取 {catalog['bytes_read'] / 1024:.1f} KiB，"
+                f"比对 {self._catalog_stats['diffs']} 次，新增章节 {self._catalog_stats['new_chapters']}"
+            )
+        stream = self._cwm_client.stream_stats
+        if stream["requests"]:
+            lines.append(
+                f"流式轮询：{stream['requests']} 次，提前结束 {stream['truncated']} 次，"
+                f"平均读取 {stream['bytes_read'] / stream['requests'] / 1024:.1f} KiB"
+            )
+        levels = self._cwm_client.limiter.levels()
+        if levels:
+            lines.append(
+                "限速令牌："
+                + "，".join(
+                    f"{name} {level:.1f}/{capacity:g}"
+                    for name, (level, capacity) in levels.items()
+                )
+            )
+        cover_cache = self._cwm_client.cover_cache
+        if cover_cache is not None:
+            cs = cover_cache.stats
+            lines.append(
+                f"封面缓存：{cover_cache.total_bytes / 1024 / 1024:.1f} MiB，"
+                f"内存命中 {cs['memory_hits']}，磁盘命中 {cs['disk_hits']}，"
+                f"下载 {cs['downloads']}，校验未变 {cs['revalidated']}，淘汰 {cs['evictions']}"
+            )
+        lines.append(f"请求重试：{self._cwm_client.retry_stats['retries']} 次")
+        for host, breaker in self._cwm_client.breakers.items():
+            lines.append(
+                f"熔断器 {host}：{breaker.state}，连续失败 {breaker.failures}，"
+                f"打开 {breaker.stats['opened']} 次，快速拒绝 {breaker.stats['rejected']} 次"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_cache_stats(name: str, cache: TTLCache) -> str:
+        stats = cache.stats
+        return (
+            f"{name}：{len(cache)} 条 / {cache.total_bytes / 1024:.1f} KiB，"
+            f"命中 {stats['hits']}，未命中 {stats['misses']}（命中率 {cache.hit_rate():.1%}），"
+            f"淘汰 {stats['evictions']}，过期 {stats['expired']}"
+        )
+
+    async def _fetch_latest_meta(self, book_id: int) -> BookMeta | None:
         CWM_SUBSCRIBE_DEBUG and logger.debug(
             "[cwm] 获取最新元数据开始：book_id=%s", book_id
         )
         try:
             bid = int(book_id)
-            html = await self._run_sync(self._cwm_client.get_book_details, bid)
-            data = parse_book_details_html_content(html) or {}
+            data = await self._load_book_details(bid)
             meta = self._build_book_meta(bid, data)
             CWM_SUBSCRIBE_DEBUG and logger.debug(
                 "[cwm] 获取最新元数据成功：book_id=%s ts=%s chapter=%s title=%s",
                 book_id,
-                meta["timestamp"],
-                meta["chapter"],
-                meta["title_text"],
+                meta.timestamp,
+                meta.chapter,
+                meta.title_text,
             )
             return meta
         except Exception as e:
@@ -739,6 +1125,97 @@ class GetcwmPlugin(Star):
             None, functools.partial(func, *args, **kwargs)
         )
 
+    async def _run_cpu(self, func, /, *args, **kwargs):
+        """CPU 密集的纯函数：配置了 cpu_workers 时在进程池执行，否则同 _run_sync"""
+        return await self._cpu.run(func, *args, **kwargs)
+
+    def _resolve_card_backend(self, kind: str, backend) -> str:
+        backend = str(backend or "html").strip().lower()
+        if backend not in CARD_BACKENDS:
+            logger.warning(f"[Getcwm] 未知的卡片后端 {kind}={backend!r}，使用 html")
+            return "html"
+        if backend == "pillow":
+            if not pillow_available():
+                logger.warning(f"[Getcwm] 未安装 Pillow，{kind} 卡片改用 html 渲染")
+                return "html"
+            if not self._card_font:
+                logger.warning(f"[Getcwm] 未找到中文字体，{kind} 卡片改用 html 渲染")
+                return "html"
+        return backend
+
+    async def _render_card(
+        self, kind: str, build_html, draw_png, /, *args, interactive=True, **kwargs
+    ):
+        """按卡片类型配置的后端渲染，返回 PNG 路径。
+
+        pillow 后端直接在 CPU 任务中绘制；html 后端先生成 HTML 再交给截图池。
+        启用渲染缓存时，输入相同的卡片直接返回缓存中的图片，并发的相同渲染只执行一次。
+        实际渲染经过渲染调度，``interactive`` 为 False 的后台推送排在指令之后；
+        交互渲染排队过长时抛出 RenderBusyError。
+        """
+        cache = self._render_cache
+        if cache is None:
+            path = await self._render_scheduler.run(
+                self._render_card_uncached,
+                kind,
+                build_html,
+                draw_png,
+                *args,
+                interactive=interactive,
+                **kwargs,
+            )
+            await self._run_sync(self._render_store.add, path)
+            return path
+        backend = self._card_backends[kind]
+        key = cache.make_key(
+            {
+                "kind": kind,
+                "backend": backend,
+                "version": (
+                    RASTER_TEMPLATE_VERSION
+                    if backend == "pillow"
+                    else CARD_TEMPLATE_VERSION
+                ),
+                "font": self._card_font if backend == "pillow" else "",
+                "args": args,
+                "kwargs": kwargs,
+            }
+        )
+
+        async def render() -> str:
+            cached = await self._run_sync(cache.lookup, key)
+            if cached is not None:
+                CWM_RENDER_DEBUG and logger.debug(
+                    "[cwm] 渲染缓存命中：kind=%s key=%s", kind, key[:12]
+                )
+                return cached
+            path = await self._render_scheduler.run(
+                self._render_card_uncached,
+                kind,
+                build_html,
+                draw_png,
+                *args,
+                interactive=interactive,
+                **kwargs,
+            )
+            return await self._run_sync(cache.store_file, key, path)
+
+        return await self._flights.do(("render", key), render)
+
+    async def _render_card_uncached(
+        self, kind: str, build_html, draw_png, /, *args, **kwargs
+    ) -> str:
+        if self._card_backends[kind] == "pillow":
+            return await self._run_cpu(
+                draw_png,
+                *args,
+                output_dir=self._render_dir,
+                font_path=self._card_font,
+                **kwargs,
+            )
+        card = await self._run_cpu(build_html, *args, **kwargs)
+        return await self._renderer.render(card, output_dir=self._render_dir)
+
     def _extract_book_id(self, url: str) -> int | None:
         if not url:
             return None
@@ -746,20 +1223,25 @@ class GetcwmPlugin(Star):
         return int(m.group(1)) if m else None
 
     def _format_search_text(
-        self, items: list[dict[str, str]], *, query: str, max_items: int
+        self,
+        items: Iterable[SearchItem],
+        *,
+        total: int,
+        query: str,
+        max_items: int,
     ) -> str:
-        results = list(items)[: max(1, int(max_items))]
+        results = list(itertools.islice(items, max(1, int(max_items))))
         lines: list[str] = [
             f"刺猬猫搜索：{query}",
-            f"共找到 {len(items)} 条结果，展示前 {len(results)} 条：",
+            f"共找到 {max(total, len(results))} 条结果，展示前 {len(results)} 条：",
         ]
         for idx, it in enumerate(results, start=1):
-            title = it.get("title", "") or "未知标题"
-            author = it.get("author", "") or "未知作者"
-            update_time = it.get("update_time", "") or "未知更新"
-            read_url = it.get("read_url", "") or ""
+            title = it.title or "未知标题"
+            author = it.author or "未知作者"
+            update_time = it.update_time or "未知更新"
+            read_url = it.read_url
             book_id = self._extract_book_id(read_url)
-            desc = (it.get("description", "") or "").strip()
+            desc = it.description.strip()
             if len(desc) > 80:
                 desc = desc[:80].rstrip() + "…"
 
@@ -774,16 +1256,16 @@ class GetcwmPlugin(Star):
                 lines.append(f"   简介：{desc}")
         return "\n".join(lines).strip()
 
-    def _format_book_details_text(self, data: dict, *, book_id: int) -> str:
-        works_name = data.get("Works_Name") or f"书籍ID：{book_id}"
-        author_name = data.get("Author_Name") or "未知作者"
-        tags = data.get("Tag_List") or []
-        chapter_name = data.get("Chapter_Name") or "未知章节"
-        update_ts = data.get("Update_Time")
-        intro = (data.get("Brief_Introduction") or "").strip()
-        cover = data.get("Cover_Image") or ""
+    def _format_book_details_text(self, data: BookDetails, *, book_id: int) -> str:
+        works_name = data.works_name or f"书籍ID：{book_id}"
+        author_name = data.author_name or "未知作者"
+        tags = data.tag_list
+        chapter_name = data.chapter_name or "未知章节"
+        update_ts = data.update_time
+        intro = data.brief_introduction.strip()
+        cover = data.cover_image
 
-        stat = data.get("data2") or {}
+        stat = dict(data.stats)
         click = stat.get("总点击", "未知")
         fav = stat.get("总收藏", "未知")
         words = stat.get("总字数", "未知")
@@ -792,14 +1274,14 @@ class GetcwmPlugin(Star):
         if tags:
             lines.append("标签：" + " / ".join([str(t) for t in tags if t]))
         lines.append(f"最新章节：{chapter_name}")
-        if isinstance(update_ts, int) and update_ts > 0:
+        if update_ts > 0:
             lines.append(f"更新时间：{format_ts_cn(update_ts)}")
         lines.append(f"总点击：{click}  总收藏：{fav}  总字数：{words}")
 
-        extra = data.get("data") or {}
+        extra = data.properties
         if extra:
             extras = []
-            for k, v in list(extra.items())[:8]:
+            for k, v in extra[:8]:
                 extras.append(f"{k}:{v}")
             if extras:
                 lines.append("其它：" + "  ".join(extras))
@@ -821,7 +1303,11 @@ class GetcwmPlugin(Star):
             image_path = await generate_image_func(*args, **kwargs)
             image_file = Path(image_path) if image_path else None
             if image_file and image_file.exists():
-                yield event.chain_result([Comp.Image.fromFileSystem(str(image_file))])
+                # 发送完成前不让 renders 清理删除这张图片
+                with self._render_store.pinned(image_file):
+                    yield event.chain_result(
+                        [Comp.Image.fromFileSystem(str(image_file))]
+                    )
                 return
 
             text_message = generate_text_func(*args, **kwargs)
@@ -829,6 +1315,13 @@ class GetcwmPlugin(Star):
                 f"图片生成失败，使用文本模式显示\n\n{text_message}"
             )
 
+        except RenderBusyError as busy:
+            CWM_RENDER_DEBUG and logger.debug("[cwm] 渲染排队过长，改用文本：%s", busy)
+            text_message = generate_text_func(*args, **kwargs)
+            yield event.plain_result(
+                f"当前图片渲染排队较多，先以文本模式显示\n\n{text_message}"
+            )
+
         except Exception as render_error:
             text_message = generate_text_func(*args, **kwargs)
             yield event.plain_result(
@@ -845,6 +1338,7 @@ class GetcwmPlugin(Star):
         self.b2u = subscribe_data.get("b2u", {}) or {}
         self.u2b = subscribe_data.get("u2b", {}) or {}
         self.bmeta = subscribe_data.get("bmeta", {}) or {}
+        self.chapter_index = subscribe_data.get("chapters", {}) or {}
         total_links = sum(len(v) for v in (self.b2u or {}).values())
         CWM_SUBSCRIBE_DEBUG and logger.debug(
             "[cwm] 初始化：订阅数据加载完成。books=%s sessions=%s links=%s meta=%s",
@@ -854,6 +1348,31 @@ class GetcwmPlugin(Star):
             len(self.bmeta or {}),
         )
         await self.start_subscribe_task()
+        self._render_sweep_task = asyncio.create_task(self._sweep_renders())
+
+    async def _sweep_renders(self):
+        """renders 目录后台清理：启动时扫描一次目录建立索引，之后只按索引定期清理"""
+        try:
+            loaded = await self._run_sync(self._render_store.load)
+            if self._render_cache is not None:
+                await self._run_sync(self._render_cache.load)
+            CWM_RENDER_DEBUG and logger.debug(
+                "[cwm] renders 索引建立完成：existing=%s", loaded
+            )
+            while True:
+                try:
+                    removed = await self._run_sync(self._render_store.sweep)
+                    CWM_RENDER_DEBUG and removed and logger.debug(
+                        "[cwm] renders 清理：removed=%s files=%s bytes=%s",
+                        removed,
+                        len(self._render_store),
+                        self._render_store.total_bytes,
+                    )
+                except Exception as e:
+                    logger.error(f"[Getcwm] renders 清理失败: {e}")
+                await asyncio.sleep(self._render_sweep_interval_s)
+        except asyncio.CancelledError:
+            pass
 
     # 异步卸载函数
     async def terminate(self):
@@ -882,6 +1401,12 @@ class GetcwmPlugin(Star):
             "[cwm] 终止：持久化订阅数据。file=%s", self.subscribe_data_file
         )
         await self._save_subscribe_data()
+        if self._render_sweep_task and not self._render_sweep_task.done():
+            self._render_sweep_task.cancel()
+            await asyncio.gather(self._render_sweep_task, return_exceptions=True)
+        await self._cwm_client.close()
+        await self._renderer.close()
+        self._cpu.close()
 
     # 保存订阅数据
     async def _save_subscribe_data(self):
@@ -889,13 +1414,15 @@ class GetcwmPlugin(Star):
         async with self._subscribe_lock:
             b2u = {str(k): list(v) for k, v in self.b2u.items()}
             u2b = {str(k): list(v) for k, v in self.u2b.items()}
-            bmeta = {str(k): dict(v) for k, v in self.bmeta.items()}
+            bmeta = {str(k): v.to_dict() for k, v in self.bmeta.items()}
+            chapters = {str(k): v.to_list() for k, v in self.chapter_index.items()}
             books_count = len(b2u)
             sessions_count = len(u2b)
             links_count = sum(len(v) for v in b2u.values())
             meta_count = len(bmeta)
         payload = json.dumps(
-            {"b2u": b2u, "u2b": u2b, "bmeta": bmeta}, ensure_ascii=False
+            {"b2u": b2u, "u2b": u2b, "bmeta": bmeta, "chapters": chapters},
+            ensure_ascii=False,
         )
         CWM_SUBSCRIBE_DEBUG and logger.debug(
             "[cwm] 保存订阅数据：file=%s books=%s sessions=%s links=%s meta=%s payload_chars=%s",
@@ -926,7 +1453,7 @@ class GetcwmPlugin(Star):
     # 异步加载订阅数据
     async def _load_subscribe_data(self):
         """异步加载订阅数据"""
-        out = {"b2u": {}, "u2b": {}, "bmeta": {}}
+        out = {"b2u": {}, "u2b": {}, "bmeta": {}, "chapters": {}}
         try:
             CWM_SUBSCRIBE_DEBUG and logger.debug(
                 "[cwm] 加载订阅数据：file=%s", self.subscribe_data_file
@@ -977,7 +1504,7 @@ class GetcwmPlugin(Star):
                     raw_bmeta = raw.get("bmeta", {}) or {}
                     if not isinstance(raw_bmeta, dict):
                         raw_bmeta = {}
-                    bmeta: dict[int, dict] = {}
+                    bmeta: dict[int, BookMeta] = {}
                     for k, v in raw_bmeta.items():
                         try:
                             bid = int(k)
@@ -985,18 +1512,25 @@ class GetcwmPlugin(Star):
                             continue
                         if not isinstance(v, dict):
                             continue
-                        bmeta[bid] = self._build_book_meta(
-                            bid,
-                            {
-                                "Works_Name": v.get("title_text", v.get("title", "")),
-                                "Chapter_Name": v.get("chapter", ""),
-                                "Update_Time": v.get("timestamp", -1),
-                            },
-                        )
+                        bmeta[bid] = BookMeta.from_dict(v, book_id=bid)
+
+                    raw_chapters = raw.get("chapters", {}) or {}
+                    if not isinstance(raw_chapters, dict):
+                        raw_chapters = {}
+                    chapters: dict[int, ChapterIndex] = {}
+                    for k, v in raw_chapters.items():
+                        try:
+                            bid = int(k)
+                            index = ChapterIndex(v)
+                        except Exception:
+                            continue
+                        if bid in b2u and len(index):
+                            chapters[bid] = index
 
                     out["b2u"] = b2u
                     out["u2b"] = u2b
                     out["bmeta"] = bmeta
+                    out["chapters"] = chapters
             else:
                 CWM_SUBSCRIBE_DEBUG and logger.debug(
                     "[cwm] 加载订阅数据：文件不存在，使用默认值"
@@ -1109,6 +1643,40 @@ class GetcwmPlugin(Star):
             "[cwm] 定时订阅任务退出：running=%s", self.subscribe_running
         )
 
+    async def _fetch_book_for_check(
+        self, book_id: int
+    ) -> tuple[str, BookDetails | None]:
+        """更新检测：条件请求并解析单本书详情。
+
+        返回 ("ok", details)，或 not_modified / identical / unchanged / blocked /
+        failed 状态与 None，单本失败不影响其他书籍。
+        """
+        CWM_SUBSCRIBE_DEBUG and logger.debug(
+            "[cwm] 更新检测：获取详情。book_id=%s", book_id
+        )
+        try:
+            user_fetch = self._flights.inflight(("details", int(book_id)))
+            if user_fetch is not None:
+                # 用户指令正在完整抓取该书，直接复用其结果
+                return "ok", await asyncio.shield(user_fetch)
+            status, details = await self._flights.do(
+                ("poll", int(book_id)),
+                functools.partial(self._poll_and_parse_details, int(book_id)),
+            )
+            CWM_SUBSCRIBE_DEBUG and status != "ok" and logger.debug(
+                "[cwm] 更新检测：无需解析。book_id=%s status=%s", book_id, status
+            )
+            return status, details
+        except BlockedPageError as e:
+            logger.warning(f"[cwm] 更新检测：站点返回 {e.kind} 页面 book_id={book_id}")
+            return "blocked", None
+        except Exception as e:
+            logger.error(f"[cwm] 获取订阅详情失败 book_id={book_id}: {e}")
+            CWM_SUBSCRIBE_DEBUG and logger.debug(
+                "[cwm] 更新检测：获取详情失败。book_id=%s err=%s", book_id, e
+            )
+            return "failed", None
+
     async def _check_updates(self):
         async with self._subscribe_lock:
             book_ids = list(self.b2u.keys())
@@ -1118,36 +1686,40 @@ class GetcwmPlugin(Star):
             return
 
         CWM_SUBSCRIBE_DEBUG and logger.debug(
-            "[cwm] 更新检测：开始。books=%s", len(book_ids)
+            "[cwm] 更新检测：开始。books=%s max_at_once=%s max_per_second=%s",
+            len(book_ids),
+            self._check_max_at_once,
+            self._check_max_per_second,
         )
+        self._cwm_client.prune_validators(book_ids)
+        keep = set(book_ids)
+        for bid in [bid for bid in self._page_digests if bid not in keep]:
+            del self._page_digests[bid]
+        fetched = await aiometer.run_all(
+            [functools.partial(self._fetch_book_for_check, bid) for bid in book_ids],
+            max_at_once=self._check_max_at_once,
+            max_per_second=self._check_max_per_second,
+        )
+
         dirty = False
-        for bid in book_ids:
-            CWM_SUBSCRIBE_DEBUG and logger.debug(
-                "[cwm] 更新检测：获取详情。book_id=%s", bid
-            )
-            try:
-                html = await self._run_sync(self._cwm_client.get_book_details, int(bid))
-                details = parse_book_details_html_content(html) or {}
-            except Exception as e:
-                logger.error(f"[cwm] 获取订阅详情失败 book_id={bid}: {e}")
-                CWM_SUBSCRIBE_DEBUG and logger.debug(
-                    "[cwm] 更新检测：获取详情失败。book_id=%s err=%s", bid, e
-                )
-                continue
+        pending_pushes: list[tuple[int, BookDetails, list[str], BookMeta]] = []
+        async with self._subscribe_lock:
+            for bid, (_, details) in zip(book_ids, fetched):
+                if details is None:
+                    continue
 
-            new_ts = self._safe_int(details.get("Update_Time"))
-            if new_ts <= 0:
-                CWM_SUBSCRIBE_DEBUG and logger.debug(
-                    "[cwm] 更新检测：更新时间无效，跳过。book_id=%s update_time=%s",
-                    bid,
-                    new_ts,
-                )
-                continue
+                new_ts = details.update_time
+                if new_ts <= 0:
+                    CWM_SUBSCRIBE_DEBUG and logger.debug(
+                        "[cwm] 更新检测：更新时间无效，跳过。book_id=%s update_time=%s",
+                        bid,
+                        new_ts,
+                    )
+                    continue
 
-            new_meta = self._build_book_meta(int(bid), details)
-            new_chapter = new_meta["chapter"]
+                new_meta = self._build_book_meta(int(bid), details)
+                new_chapter = new_meta.chapter
 
-            async with self._subscribe_lock:
                 subscribers = list(self.b2u.get(int(bid), []) or [])
                 CWM_SUBSCRIBE_DEBUG and logger.debug(
                     "[cwm] 更新检测：加载订阅者。book_id=%s subscribers=%s",
@@ -1156,15 +1728,16 @@ class GetcwmPlugin(Star):
                 )
                 if not subscribers:
                     self.bmeta.pop(int(bid), None)
+                    self.chapter_index.pop(int(bid), None)
                     dirty = True
                     CWM_SUBSCRIBE_DEBUG and logger.debug(
                         "[cwm] 更新检测：无订阅者，清理元数据。book_id=%s", bid
                     )
                     continue
 
-                old_meta = dict(self.bmeta.get(int(bid), {}) or {})
-                old_ts = self._safe_int(old_meta.get("timestamp"))
-                old_chapter = str(old_meta.get("chapter", "") or "")
+                old_meta = self.bmeta.get(int(bid)) or BookMeta()
+                old_ts = old_meta.timestamp
+                old_chapter = old_meta.chapter
                 CWM_SUBSCRIBE_DEBUG and logger.debug(
                     "[cwm] 更新检测：比较元数据。book_id=%s old_ts=%s new_ts=%s old_chapter=%s new_chapter=%s",
                     bid,
@@ -1196,35 +1769,114 @@ class GetcwmPlugin(Star):
 
                 self.bmeta[int(bid)] = new_meta
                 dirty = True
+                pending_pushes.append((int(bid), details, subscribers, old_meta))
                 CWM_SUBSCRIBE_DEBUG and logger.debug(
                     "[cwm] 更新检测：检测到更新，准备推送。book_id=%s", bid
                 )
 
-            CWM_SUBSCRIBE_DEBUG and logger.debug(
-                "[cwm] 更新检测：推送更新。book_id=%s subscribers=%s",
-                bid,
-                len(subscribers),
-            )
-            await self._push_update(int(bid), details, subscribers, old_meta=old_meta)
+        new_chapters: dict[int, list[ChapterEntry]] = {}
+        if self._catalog_tracking:
+            for bid, _, _, old_meta in pending_pushes:
+                try:
+                    new_chapters[bid] = await self._fetch_new_chapters(bid, old_meta)
+                    dirty = True
+                except Exception as e:
+                    # 目录获取失败时仍按单章推送
+                    logger.error(f"[cwm] 获取章节目录失败 book_id={bid}: {e}")
 
         if dirty:
             CWM_SUBSCRIBE_DEBUG and logger.debug(
                 "[cwm] 更新检测：元数据已变更，保存订阅数据"
             )
             await self._save_subscribe_data()
-        else:
-            CWM_SUBSCRIBE_DEBUG and logger.debug("[cwm] 更新检测：完成，无变更")
+
+        for bid, details, subscribers, old_meta in pending_pushes:
+            CWM_SUBSCRIBE_DEBUG and logger.debug(
+                "[cwm] 更新检测：推送更新。book_id=%s subscribers=%s",
+                bid,
+                len(subscribers),
+            )
+            try:
+                await self._push_update(
+                    bid,
+                    details,
+                    subscribers,
+                    old_meta=old_meta,
+                    new_chapters=new_chapters.get(bid, ()),
+                )
+            except Exception as e:
+                logger.error(f"[cwm] 推送更新失败 book_id={bid}: {e}")
+
+        counts = collections.Counter(status for status, _ in fetched)
+        self._last_check_counts = {"books": len(book_ids), **counts}
+        CWM_SUBSCRIBE_DEBUG and logger.debug(
+            "[cwm] 更新检测：完成。books=%s not_modified=%s identical=%s unchanged=%s blocked=%s failed=%s pushed=%s dirty=%s",
+            len(book_ids),
+            counts["not_modified"],
+            counts["identical"],
+            counts["unchanged"],
+            counts["blocked"],
+            counts["failed"],
+            len(pending_pushes),
+            dirty,
+        )
+
+    async def _fetch_new_chapters(
+        self, book_id: int, old_meta: BookMeta
+    ) -> list[ChapterEntry]:
+        """拉取章节目录，返回上次推送以来新增的章节（按目录顺序）并更新章节索引。
+
+        已有索引时先只读目录末尾 ``catalog_tail_kib``，末尾找不到任何已知章节
+        再读完整目录；没有索引时读完整目录，按旧基线的章节名定位。
+        都定位不到时返回空列表，由调用方按单章推送。
+        """
+        bid = int(book_id)
+        index = self.chapter_index.get(bid)
+        page = await self._cwm_client.fetch_chapter_catalog(
+            bid,
+            tail_bytes=self._catalog_tail_bytes if index is not None else 0,
+            interactive=False,
+        )
+        chapters = await self._run_cpu(parse_chapter_catalog, page.html)
+        new = index.diff(chapters) if index is not None else None
+        if new is None and not page.complete:
+            self._catalog_stats["tail_miss"] += 1
+            page = await self._cwm_client.fetch_chapter_catalog(bid, interactive=False)
+            chapters = await self._run_cpu(parse_chapter_catalog, page.html)
+            new = index.diff(chapters) if index is not None else None
+        if new is None:
+            new = chapters_after_title(chapters, old_meta.chapter) or []
+
+        self._catalog_stats["diffs"] += 1
+        self._catalog_stats["new_chapters"] += len(new)
+        async with self._subscribe_lock:
+            if bid in self.b2u:
+                if index is None:
+                    self.chapter_index[bid] = ChapterIndex(
+                        c.chapter_id for c in chapters
+                    )
+                else:
+                    index.add(c.chapter_id for c in chapters)
+        CWM_SUBSCRIBE_DEBUG and logger.debug(
+            "[cwm] 更新检测：章节目录比对完成。book_id=%s chapters=%s complete=%s new=%s",
+            bid,
+            len(chapters),
+            page.complete,
+            len(new),
+        )
+        return new
 
     async def _push_update(
         self,
         book_id: int,
-        details: dict,
+        details: BookDetails,
         subscribers: list[str],
         *,
-        old_meta: dict | None = None,
+        old_meta: BookMeta | None = None,
+        new_chapters: Sequence[ChapterEntry] = (),
     ) -> dict:
         update_text = self._format_subscribe_update_text(
-            book_id, details, old_meta=old_meta
+            book_id, details, old_meta=old_meta, new_chapters=new_chapters
         )
         CWM_SUBSCRIBE_DEBUG and logger.debug(
             "[cwm] 推送更新：开始。book_id=%s subscribers=%s text_chars=%s has_old_meta=%s",
@@ -1236,12 +1888,17 @@ class GetcwmPlugin(Star):
 
         image_path = None
         try:
-            image_path = await self._run_sync(
-                render_subscribe_update_card,
-                details,
+            cover_data_uri = await self._cwm_client.fetch_image_data_uri(
+                details.cover_image, interactive=False
+            )
+            image_path = await self._render_card(
+                "update",
+                build_subscribe_update_card_html,
+                draw_subscribe_update_card,
+                details.to_dict(),
                 book_id=int(book_id),
-                output_dir=self._render_dir,
-                session=self._cwm_client.session,
+                cover_data_uri=cover_data_uri or "",
+                interactive=False,
             )
             CWM_SUBSCRIBE_DEBUG and logger.debug(
                 "[cwm] 推送更新：卡片渲染完成。book_id=%s image_path=%s",
@@ -1265,6 +1922,24 @@ class GetcwmPlugin(Star):
             len(getattr(chain, "chain", []) or []),
         )
 
+        # 发送给全部订阅者之前不让 renders 清理删除这张图片
+        with self._render_store.pinned(image_path if has_image else None):
+            ok, failed = await self._send_update_chain(book_id, chain, subscribers)
+
+        CWM_SUBSCRIBE_DEBUG and logger.debug(
+            "[cwm] 推送更新：完成。book_id=%s ok=%s failed=%s", book_id, ok, failed
+        )
+
+        return {
+            "ok": ok,
+            "failed": failed,
+            "has_image": has_image,
+            "image_path": str(image_path) if image_path else None,
+        }
+
+    async def _send_update_chain(
+        self, book_id: int, chain, subscribers: list[str]
+    ) -> tuple[int, int]:
         ok = 0
         failed = 0
         for umo in subscribers:
@@ -1286,24 +1961,19 @@ class GetcwmPlugin(Star):
                     umo,
                     e,
                 )
-
-        CWM_SUBSCRIBE_DEBUG and logger.debug(
-            "[cwm] 推送更新：完成。book_id=%s ok=%s failed=%s", book_id, ok, failed
-        )
-
-        return {
-            "ok": ok,
-            "failed": failed,
-            "has_image": has_image,
-            "image_path": str(image_path) if image_path else None,
-        }
+        return ok, failed
 
     def _format_subscribe_update_text(
-        self, book_id: int, details: dict, *, old_meta: dict | None = None
+        self,
+        book_id: int,
+        details: BookDetails,
+        *,
+        old_meta: BookMeta | None = None,
+        new_chapters: Sequence[ChapterEntry] = (),
     ) -> str:
-        works_name = details.get("Works_Name") or f"书籍ID：{int(book_id)}"
-        chapter_name = details.get("Chapter_Name") or "未知章节"
-        update_ts = self._safe_int(details.get("Update_Time"))
+        works_name = details.works_name or f"书籍ID：{int(book_id)}"
+        chapter_name = details.chapter_name or "未知章节"
+        update_ts = details.update_time
         url = f"https://www.ciweimao.com/book/{int(book_id)}"
 
         lines = [
@@ -1314,8 +1984,8 @@ class GetcwmPlugin(Star):
         if update_ts > 0:
             lines.append(f"更新时间：{format_ts_cn(update_ts)}")
         if old_meta:
-            old_ch = str(old_meta.get("chapter", "") or "")
-            old_ts = self._safe_int(old_meta.get("timestamp"))
+            old_ch = old_meta.chapter
+            old_ts = old_meta.timestamp
             if old_ch or old_ts > 0:
                 old_line = "上次记录："
                 if old_ch:
@@ -1323,5 +1993,11 @@ class GetcwmPlugin(Star):
                 if old_ts > 0:
                     old_line += f" ({format_ts_cn(old_ts)})"
                 lines.append(old_line)
+        if len(new_chapters) > 1:
+            lines.append(f"新增 {len(new_chapters)} 章：")
+            shown = new_chapters[-MAX_LISTED_CHAPTERS:]
+            if len(new_chapters) > len(shown):
+                lines.append(f"  …（省略前 {len(new_chapters) - len(shown)} 章）")
+            lines.extend(f"  {chapter.title}" for chapter in shown)
         lines.append(f"链接：{url}")
         return "\n".join(lines).strip()
@@ -1,27 +1,96 @@
 from .cards import (
+    build_book_details_card_html,
+    build_search_card_html,
+    build_subscribe_update_card_html,
+    CardHtml,
     handle_book_details_html_content,
     handle_search_html_content,
     render_book_details_card,
+    render_card_html,
     render_search_card,
     render_subscribe_update_card,
 )
+from .catalog import ChapterIndex
 from .core import (
+    AsyncCiweimaoClient,
+    BlockedPageError,
+    BookDetails,
+    BookMeta,
     CardRenderResult,
+    CatalogPage,
+    ChapterEntry,
     CiweimaoClient,
+    classify_page,
+    count_search_items,
     format_ts_cn,
+    get_parser_backend,
+    iter_search_items,
+    parse_book_details,
     parse_book_details_html_content,
+    parse_chapter_catalog,
     parse_search_html_content,
+    parse_search_items,
+    ParserBackend,
+    probe_book_update,
+    SearchItem,
+    set_default_parser_backend,
+    UpdateProbe,
 )
+from .offload import CpuOffloader
+from .raster import (
+    draw_book_details_card,
+    draw_search_card,
+    draw_subscribe_update_card,
+    find_cjk_font,
+)
+from .renderer import RenderBusyError, RendererPool, RenderScheduler
+from .throttle import CircuitBreaker, CircuitOpenError, RateLimiter, TokenBucket
 
 __all__ = [
+    "AsyncCiweimaoClient",
+    "BlockedPageError",
+    "BookDetails",
+    "BookMeta",
+    "build_book_details_card_html",
+    "build_search_card_html",
+    "build_subscribe_update_card_html",
+    "CardHtml",
     "CardRenderResult",
+    "CatalogPage",
+    "ChapterEntry",
+    "ChapterIndex",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "CiweimaoClient",
+    "classify_page",
+    "count_search_items",
+    "CpuOffloader",
+    "draw_book_details_card",
+    "draw_search_card",
+    "draw_subscribe_update_card",
+    "find_cjk_font",
     "format_ts_cn",
+    "get_parser_backend",
     "handle_book_details_html_content",
     "handle_search_html_content",
+    "iter_search_items",
+    "parse_book_details",
     "parse_book_details_html_content",
+    "parse_chapter_catalog",
     "parse_search_html_content",
+    "parse_search_items",
+    "ParserBackend",
+    "probe_book_update",
+    "RateLimiter",
     "render_book_details_card",
+    "render_card_html",
     "render_search_card",
     "render_subscribe_update_card",
+    "RenderBusyError",
+    "RendererPool",
+    "RenderScheduler",
+    "SearchItem",
+    "set_default_parser_backend",
+    "TokenBucket",
+    "UpdateProbe",
 ]
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """合并相同 key 的并发调用：同一时刻每个 key 只有一个请求在途，其余调用方等待并共享结果。
+
+    在途请求以独立 Task 运行，单个调用方被取消不会中断其他等待者。
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        self.stats = {"calls": 0, "shared": 0}
+
+    def inflight(self, key: Hashable) -> asyncio.Task[Any] | None:
+        return self._inflight.get(key)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["shared"] += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 所有等待者都被取消时，避免 "exception was never retrieved" 告警
+        if not task.cancelled():
+            task.exception()
+
+
+def approx_sizeof(obj: Any) -> int:
+    """粗略估算解析结果（dict/list/str 及 __slots__ 记录嵌套）占用的字节数"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += approx_sizeof(k) + approx_sizeof(v)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for v in obj:
+            size += approx_sizeof(v)
+    elif hasattr(type(obj), "__slots__"):
+        for name in type(obj).__slots__:
+            size += approx_sizeof(getattr(obj, name, None))
+    return size
+
+
+class TTLCache(Generic[T]):
+    """带过期时间的 LRU 缓存，同时按条目数与估算字节数淘汰。"""
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float,
+        max_entries: int,
+        max_bytes: int,
+        sizeof: Callable[[Any], int] = approx_sizeof,
+    ) -> None:
+        self.ttl_s = float(ttl_s)
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self._sizeof = sizeof
+        # key -> (过期时间, 估算字节数, 值)
+        self._data: OrderedDict[Hashable, tuple[float, int, T]] = OrderedDict()
+        self.total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> T | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def peek(self, key: Hashable) -> T | None:
+        """读取未过期的值，不计入统计也不更新 LRU 顺序"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[2]
+
+    def put(self, key: Hashable, value: T) -> None:
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            self.pop(key)
+            return
+        self.pop(key)
+        self._data[key] = (time.monotonic() + self.ttl_s, size, value)
+        self.total_bytes += size
+        while len(self._data) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def pop(self, key: Hashable) -> T | None:
+        if key not in self._data:
+            return None
+        return self._remove(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.total_bytes = 0
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def _remove(self, key: Hashable) -> T:
+        _, size, value = self._data.pop(key)
+        self.total_bytes -= size
+        return value
+
+
+@dataclass(frozen=True)
+class CoverEntry:
+    data_uri: str
+    fresh: bool
+    etag: str = ""
+    last_modified: str = ""
+
+
+class CoverCache:
+    """封面图片磁盘缓存：按 URL 建索引，按内容哈希存文件（相同图片只存一份）。
+
+    磁盘总大小超过 ``max_bytes`` 时按最近最少使用淘汰；前面有一层内存 LRU
+    缓存 data URI。同一 URL 距上次校验超过 ``revalidate_s`` 才需要重新校验。
+    方法会在线程池中调用，内部状态由锁保护。
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_bytes: int,
+        revalidate_s: float,
+        memory_max_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(1, int(max_bytes))
+        self.revalidate_s = float(revalidate_s)
+        self._memory: TTLCache[str] = TTLCache(
+            ttl_s=max(1.0, self.revalidate_s),
+            max_entries=256,
+            max_bytes=memory_max_bytes,
+            sizeof=len,
+        )
+        # url -> {"hash", "content_type", "etag", "last_modified", "checked_at"}
+        self._urls: dict[str, dict[str, Any]] = {}
+        # 内容哈希 -> 文件字节数，按最近使用排序
+        self._blobs: OrderedDict[str, int] = OrderedDict()
+        self.total_bytes = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "downloads": 0,
+            "evictions": 0,
+        }
+
+    def peek(self, url: str) -> CoverEntry | None:
+        """只查内存层，命中且无需校验时返回，不触碰磁盘"""
+        with self._lock:
+            meta = self._urls.get(url)
+            if meta is None or not self._is_fresh(meta):
+                return None
+            data_uri = self._memory.get(url)
+            if data_uri is None:
+                return None
+            self.stats["memory_hits"] += 1
+            self._blobs.move_to_end(meta["hash"])
+            return self._entry(meta, data_uri)
+
+    def lookup(self, url: str) -> CoverEntry | None:
+        with self._lock:
+            self._ensure_loaded()
+            meta = self._urls.get(url)
+            if meta is None:
+                self.stats["misses"] += 1
+                return None
+            data_uri = self._memory.get(url)
+            if data_uri is not None:
+                self.stats["memory_hits"] += 1
+            else:
+                try:
+                    body = (self.root / meta["hash"]).read_bytes()
+                except OSError:
+                    self._urls.pop(url, None)
+                    self._drop_blob(meta["hash"])
+                    self.stats["misses"] += 1
+                    return None
+                data_uri = _to_data_uri(body, meta["content_type"])
+                self._memory.put(url, data_uri)
+                self.stats["disk_hits"] += 1
+            self._blobs.move_to_end(meta["hash"])
+            return self._entry(meta, data_uri)
+
+    def mark_checked(self, url: str) -> None:
+        with self._lock:
+            meta = self._urls.get(url)
+            if meta is not None:
+                meta["checked_at"] = time.time()
+                self.stats["revalidated"] += 1
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        content_type: str,
+        *,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        data_uri = _to_data_uri(body, content_type)
+        with self._lock:
+            self._ensure_loaded()
+            self.stats["downloads"] += 1
+            if digest not in self._blobs:
+                self.root.mkdir(parents=True, exist_ok=True)
+                blob = self.root / digest
+                tmp = blob.with_suffix(".tmp")
+                tmp.write_bytes(body)
+                tmp.replace(blob)
+                self._blobs[digest] = len(body)
+                self.total_bytes += len(body)
+            self._blobs.move_to_end(digest)
+            self._urls[url] = {
+                "hash": digest,
+                "content_type": content_type,
+                "etag": etag,
+                "last_modified": last_modified,
+                "checked_at": time.time(),
+            }
+            self._memory.put(url, data_uri)
+            while self.total_bytes > self.max_bytes and len(self._blobs) > 1:
+                self._drop_blob(next(iter(self._blobs)))
+                self.stats["evictions"] += 1
+            self._save_index()
+        return data_uri
+
+    def _is_fresh(self, meta: dict[str, Any]) -> bool:
+        return time.time() - float(meta.get("checked_at", 0)) < self.revalidate_s
+
+    def _entry(self, meta: dict[str, Any], data_uri: str) -> CoverEntry:
+        return CoverEntry(
+            data_uri=data_uri,
+            fresh=self._is_fresh(meta),
+            etag=str(meta.get("etag") or ""),
+            last_modified=str(meta.get("last_modified") or ""),
+        )
+
+    def _drop_blob(self, digest: str) -> None:
+        size = self._blobs.pop(digest, None)
+        if size is not None:
+            self.total_bytes -= size
+        for url in [u for u, m in self._urls.items() if m["hash"] == digest]:
+            del self._urls[url]
+            self._memory.pop(url)
+        try:
+            (self.root / digest).unlink()
+        except OSError:
+            pass
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.root.is_dir():
+            return
+        blobs = []
+        for path in self.root.iterdir():
+            if path.name == self.INDEX_FILE or path.suffix:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            blobs.append((stat.st_mtime, path.name, stat.st_size))
+        for _, digest, size in sorted(blobs):
+            self._blobs[digest] = size
+            self.total_bytes += size
+        try:
+            raw = json.loads((self.root / self.INDEX_FILE).read_text("utf-8"))
+        except (OSError, ValueError):
+            raw = {}
+        for url, meta in (raw if isinstance(raw, dict) else {}).items():
+            if isinstance(meta, dict) and meta.get("hash") in self._blobs:
+                self._urls[str(url)] = meta
+
+    def _save_index(self) -> None:
+        index = self.root / self.INDEX_FILE
+        tmp = index.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(self._urls, ensure_ascii=False), "utf-8")
+            tmp.replace(index)
+        except OSError:
+            pass
+
+
+def _to_data_uri(body: bytes, content_type: str) -> str:
+    return f"data:{content_type};base64,{base64.b64encode(body).decode('ascii')}"
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import math
+import threading
 import uuid
-from collections.abc import Mapping
-from datetime import datetime
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -23,8 +25,22 @@ from .core import (
     parse_search_html_content,
 )
 
+# 修改 HTML 卡片模板后递增，使渲染缓存中的旧图片失效
+CARD_TEMPLATE_VERSION = 2
 
-def _calc_search_card_height(num_items: int) -> int:
+
+@dataclass(frozen=True)
+class CardHtml:
+    """拼装好的卡片 HTML 与截图尺寸；纯数据，可跨进程传递"""
+
+    html: str
+    width: int
+    height: int
+    name: str
+
+
+def calc_search_card_height(num_items: int) -> int:
+    """搜索卡片高度，HTML 与 Pillow 两种后端共用"""
     n = max(1, int(num_items))
 
     body_pad_y = 26 * 2
@@ -49,7 +65,8 @@ def _calc_search_card_height(num_items: int) -> int:
     )
 
 
-def _calc_book_details_card_height(num_tags: int, num_props: int) -> int:
+def calc_book_details_card_height(num_tags: int, num_props: int) -> int:
+    """详情卡片高度，HTML 与 Pillow 两种后端共用"""
     tags = max(0, int(num_tags))
     props = max(0, int(num_props))
 
@@ -75,6 +92,17 @@ def _calc_book_details_card_height(num_tags: int, num_props: int) -> int:
     return body_pad_y + card_pad_y + top_h + main_mt + main_h + safety
 
 
+_html2image_local = threading.local()
+
+
+def _thread_html2image() -> Any:
+    # Html2Image 创建时要查找浏览器、建临时目录；每个线程复用一个实例
+    hti = getattr(_html2image_local, "hti", None)
+    if hti is None:
+        hti = _html2image_local.hti = Html2Image()
+    return hti
+
+
 def _render_html_to_png(
     *, html_str: str, size: tuple[int, int], output_dir: Path, filename: str
 ) -> Path:
@@ -84,7 +112,8 @@ def _render_html_to_png(
         raise RuntimeError(
             f"Missing dependency html2image, unable to render image: {err!s}"
         )
-    hti = Html2Image(output_path=str(output_dir))
+    hti = _thread_html2image()
+    hti.output_path = str(output_dir)
     try:
         hti.screenshot(html_str=html_str, save_as=filename, size=size)
     except Exception as exc:
@@ -92,18 +121,33 @@ def _render_html_to_png(
     return output_dir / filename
 
 
-def render_search_card(
-    results: list[Mapping[str, Any]],
+def render_card_html(card: CardHtml, *, output_dir: str | Path = "./renders") -> str:
+    out_path = _render_html_to_png(
+        html_str=card.html,
+        size=(card.width, card.height),
+        output_dir=Path(output_dir),
+        filename=f"{card.name}_{uuid.uuid4().hex}.png",
+    )
+    return str(out_path)
+
+
+def build_search_card_html(
+    results: Iterable[Mapping[str, Any]],
     *,
     query: str | None = None,
     max_items: int = 8,
-    output_dir: str | Path = "./renders",
-) -> str:
-    items = list(results)[: max(1, int(max_items))]
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    total: int | None = None,
+) -> CardHtml:
+    """``total`` 为结果总数；不传时读完 ``results`` 计数"""
+    if total is None:
+        results = list(results)
+        total = len(results)
+    # 只取要展示的条数，给出总数时惰性的结果迭代器不会被读完
+    items = list(islice(results, max(1, int(max_items))))
+    total = max(int(total), len(items))
 
     width = 1024
-    height = _calc_search_card_height(len(items))
+    height = calc_search_card_height(len(items))
     query_badge = f"<div class='badge'>{html_escape(query)}</div>" if query else ""
 
     rows_html: list[str] = []
@@ -268,7 +312,7 @@ def render_search_card(
     <div class="header">
       <div>
         <div class="h1">刺猬猫 · 搜索结果</div>
-        <div class="sub">共 {html_escape(len(results))} 条 · 展示前 {html_escape(len(items))} 条 · 生成于 {now_str}</div>
+        <div class="sub">共 {html_escape(total)} 条 · 展示前 {html_escape(len(items))} 条</div>
       </div>
       {query_badge}
     </div>
@@ -281,28 +325,31 @@ def render_search_card(
 </html>
 """
 
-    filename = f"search_{uuid.uuid4().hex}.png"
-    out_path = _render_html_to_png(
-        html_str=html_str,
-        size=(width, height),
-        output_dir=Path(output_dir),
-        filename=filename,
-    )
-    return str(out_path)
+    return CardHtml(html=html_str, width=width, height=height, name="search")
 
 
-def render_book_details_card(
-    details: Mapping[str, Any],
+def render_search_card(
+    results: Iterable[Mapping[str, Any]],
     *,
+    query: str | None = None,
+    max_items: int = 8,
+    total: int | None = None,
     output_dir: str | Path = "./renders",
-    session: Any | None = None,
 ) -> str:
+    card = build_search_card_html(
+        results, query=query, max_items=max_items, total=total
+    )
+    return render_card_html(card, output_dir=output_dir)
+
+
+def build_book_details_card_html(
+    details: Mapping[str, Any], *, cover_data_uri: str = ""
+) -> CardHtml:
     works_name = details.get("Works_Name", "") or ""
     author_name = details.get("Author_Name", "") or ""
     tag_list = list(details.get("Tag_List", []) or [])
     chapter_name = details.get("Chapter_Name", "") or ""
     update_ts = int(details.get("Update_Time", -1) or -1)
-    cover_url = details.get("Cover_Image", "") or ""
 
     stat_map = dict(details.get("data2", {}) or {})
     stat_click = stat_map.get("总点击", "")
@@ -314,7 +361,6 @@ def render_book_details_card(
 
     intro = (details.get("Brief_Introduction", "") or "").strip() or "（无简介）"
 
-    cover_data_uri = fetch_image_data_uri(str(cover_url), session=session)
     cover_html = (
         f"<img class='cover' src='{cover_data_uri}' alt='cover' />"
         if cover_data_uri
@@ -330,7 +376,7 @@ def render_book_details_card(
     )
 
     width = 1024
-    height = _calc_book_details_card_height(min(len(tag_list), 10), len(prop_items))
+    height = calc_book_details_card_height(min(len(tag_list), 10), len(prop_items))
 
     html_str = f"""<!doctype html>
 <html lang="zh-CN">
@@ -551,33 +597,33 @@ def render_book_details_card(
 </html>
 """
 
-    filename = f"book_{uuid.uuid4().hex}.png"
-    out_path = _render_html_to_png(
-        html_str=html_str,
-        size=(width, height),
-        output_dir=Path(output_dir),
-        filename=filename,
-    )
-    return str(out_path)
+    return CardHtml(html=html_str, width=width, height=height, name="book")
 
 
-def render_subscribe_update_card(
+def render_book_details_card(
     details: Mapping[str, Any],
     *,
-    book_id: int,
     output_dir: str | Path = "./renders",
     session: Any | None = None,
+    cover_data_uri: str | None = None,
 ) -> str:
+    if cover_data_uri is None:
+        cover_url = details.get("Cover_Image", "") or ""
+        cover_data_uri = fetch_image_data_uri(str(cover_url), session=session)
+    card = build_book_details_card_html(details, cover_data_uri=cover_data_uri or "")
+    return render_card_html(card, output_dir=output_dir)
+
+
+def build_subscribe_update_card_html(
+    details: Mapping[str, Any], *, book_id: int, cover_data_uri: str = ""
+) -> CardHtml:
     works_name = details.get("Works_Name", "") or f"书籍ID：{int(book_id)}"
     author_name = details.get("Author_Name", "") or "未知作者"
     chapter_name = details.get("Chapter_Name", "") or "未知章节"
     update_ts = int(details.get("Update_Time", -1) or -1)
-    cover_url = details.get("Cover_Image", "") or ""
 
     book_url = f"https://www.ciweimao.com/book/{int(book_id)}"
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    cover_data_uri = fetch_image_data_uri(str(cover_url), session=session)
     cover_html = (
         f"<img class='cover' src='{cover_data_uri}' alt='cover' />"
         if cover_data_uri
@@ -751,8 +797,7 @@ def render_subscribe_update_card(
         <div class="badge">NEW</div>
       </div>
       <div class="time">
-        更新于：{html_escape(format_ts_cn(update_ts))}<br/>
-        生成于：{html_escape(now_str)}
+        更新于：{html_escape(format_ts_cn(update_ts))}
       </div>
     </div>
     <div class="main">
@@ -783,14 +828,26 @@ def render_subscribe_update_card(
 </html>
 """
 
-    filename = f"update_{int(book_id)}_{uuid.uuid4().hex}.png"
-    out_path = _render_html_to_png(
-        html_str=html_str,
-        size=(width, height),
-        output_dir=Path(output_dir),
-        filename=filename,
+    return CardHtml(
+        html=html_str, width=width, height=height, name=f"update_{int(book_id)}"
     )
-    return str(out_path)
+
+
+def render_subscribe_update_card(
+    details: Mapping[str, Any],
+    *,
+    book_id: int,
+    output_dir: str | Path = "./renders",
+    session: Any | None = None,
+    cover_data_uri: str | None = None,
+) -> str:
+    if cover_data_uri is None:
+        cover_url = details.get("Cover_Image", "") or ""
+        cover_data_uri = fetch_image_data_uri(str(cover_url), session=session)
+    card = build_subscribe_update_card_html(
+        details, book_id=book_id, cover_data_uri=cover_data_uri or ""
+    )
+    return render_card_html(card, output_dir=output_dir)
 
 
 def handle_search_html_content(
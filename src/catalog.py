@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+
+from .core import ChapterEntry
+
+DEFAULT_MAX_KNOWN = 1000
+
+
+class ChapterIndex:
+    """一本书已知章节 ID 的紧凑索引。
+
+    ID 升序存放在 ``array('q')`` 中（每章 8 字节），用二分查找判断是否已知；
+    超过 ``max_known`` 时丢弃最小（最早）的 ID。只要目录中还能找到一章已知
+    章节，就能按位置算出它之后的新章节，因此不必保留全部历史。
+    """
+
+    __slots__ = ("_ids", "max_known")
+
+    def __init__(
+        self, chapter_ids: Iterable[int] = (), *, max_known: int = DEFAULT_MAX_KNOWN
+    ):
+        self.max_known = max(1, int(max_known))
+        self._ids = array("q", sorted({int(cid) for cid in chapter_ids}))
+        self._trim()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, chapter_id: object) -> bool:
+        if not isinstance(chapter_id, int):
+            return False
+        pos = bisect_left(self._ids, chapter_id)
+        return pos < len(self._ids) and self._ids[pos] == chapter_id
+
+    def _trim(self) -> None:
+        extra = len(self._ids) - self.max_known
+        if extra > 0:
+            del self._ids[:extra]
+
+    def add(self, chapter_ids: Iterable[int]) -> None:
+        new = {int(cid) for cid in chapter_ids if int(cid) not in self}
+        if new:
+            self._ids = array("q", sorted(new.union(self._ids)))
+            self._trim()
+
+    def diff(self, chapters: Sequence[ChapterEntry]) -> list[ChapterEntry] | None:
+        """返回目录中最后一章已知章节之后的章节；一章已知章节都找不到时返回 None"""
+        for pos in range(len(chapters) - 1, -1, -1):
+            if chapters[pos].chapter_id in self:
+                return list(chapters[pos + 1 :])
+        return None
+
+    def to_list(self) -> list[int]:
+        return self._ids.tolist()
+
+
+def chapters_after_title(
+    chapters: Sequence[ChapterEntry], title: str
+) -> list[ChapterEntry] | None:
+    """以章节名定位上次记录的章节（没有索引时使用），返回其后的章节；找不到返回 None"""
+    title = " ".join(title.split())
+    if not title:
+        return None
+    for pos in range(len(chapters) - 1, -1, -1):
+        if " ".join(chapters[pos].title.split()) == title:
+            return list(chapters[pos + 1 :])
+    return None
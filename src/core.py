@@ -1,19 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import codecs
+import html as htmllib
 import logging
 import re
+import threading
 import time
-from dataclasses import dataclass
+import warnings
+import zlib
+from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime, timedelta, timezone, tzinfo
-from typing import Any
-from urllib.parse import urljoin
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any, Literal
+from urllib.parse import urljoin, urlsplit
 
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .cache import CoverCache, CoverEntry
+from .throttle import (
+    DEFAULT_BREAKER_COOLDOWN_S,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_RETRIES,
+    DEFAULT_RETRY_BASE_S,
+    DEFAULT_RETRY_MAX_S,
+    CircuitBreaker,
+    RateLimiter,
+    backoff_delay,
+)
 
 BASE_URL = "https://www.ciweimao.com"
 DEFAULT_TIMEOUT_S = 10
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_PER_HOST = 4
+DEFAULT_KEEPALIVE_S = 30
+STREAM_CHUNK_SIZE = 16 * 1024
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 DEFAULT_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -30,6 +56,16 @@ try:
 except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore[assignment]
 
+try:
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+except Exception:  # pragma: no cover
+    LexborHTMLParser = None  # type: ignore[assignment]
+
+try:
+    import xxhash  # type: ignore
+except Exception:  # pragma: no cover
+    xxhash = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 CWM_CRAWLER_DEBUG = False
@@ -41,6 +77,185 @@ class CardRenderResult:
     data: Any
 
 
+@dataclass(frozen=True, slots=True)
+class SearchItem:
+    """搜索结果中的一本书"""
+
+    title: str
+    author: str
+    update_time: str
+    description: str
+    read_url: str
+
+    def to_dict(self) -> dict[str, str]:
+        return {
+            "title": self.title,
+            "author": self.author,
+            "update_time": self.update_time,
+            "description": self.description,
+            "read_url": self.read_url,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class BookDetails:
+    """详情页解析结果。
+
+    ``properties`` 对应旧字典的 ``data``（书籍属性），``stats`` 对应 ``data2``
+    （总点击 / 总收藏 / 总字数），均以 (键, 值) 元组保存以便共享、不可变。
+    """
+
+    works_name: str = ""
+    author_name: str = ""
+    tag_list: tuple[str, ...] = ()
+    chapter_name: str = ""
+    update_time: int = -1
+    brief_introduction: str = ""
+    cover_image: str = ""
+    properties: tuple[tuple[str, float | str], ...] = ()
+    stats: tuple[tuple[str, float | str], ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "Works_Name": self.works_name,
+            "Author_Name": self.author_name,
+            "Tag_List": list(self.tag_list),
+            "Chapter_Name": self.chapter_name,
+            "Update_Time": self.update_time,
+            "Brief_Introduction": self.brief_introduction,
+            "Cover_Image": self.cover_image,
+            "data": dict(self.properties),
+            "data2": dict(self.stats),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> BookDetails:
+        try:
+            update_time = int(data.get("Update_Time", -1))
+        except (TypeError, ValueError):
+            update_time = -1
+        return cls(
+            works_name=str(data.get("Works_Name") or ""),
+            author_name=str(data.get("Author_Name") or ""),
+            tag_list=tuple(data.get("Tag_List") or ()),
+            chapter_name=str(data.get("Chapter_Name") or ""),
+            update_time=update_time,
+            brief_introduction=str(data.get("Brief_Introduction") or ""),
+            cover_image=str(data.get("Cover_Image") or ""),
+            properties=tuple((data.get("data") or {}).items()),
+            stats=tuple((data.get("data2") or {}).items()),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BookMeta:
+    """订阅基线：书名、最近更新时间戳与章节名"""
+
+    title_text: str = ""
+    timestamp: int = -1
+    chapter: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "title_text": self.title_text,
+            "timestamp": self.timestamp,
+            "chapter": self.chapter,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], *, book_id: int) -> BookMeta:
+        """读取持久化的基线，兼容旧版本的 ``title`` 字段"""
+        try:
+            timestamp = int(data.get("timestamp", -1))
+        except (TypeError, ValueError):
+            timestamp = -1
+        return cls(
+            title_text=str(
+                data.get("title_text") or data.get("title") or f"书籍ID：{int(book_id)}"
+            ),
+            timestamp=timestamp,
+            chapter=str(data.get("chapter") or ""),
+        )
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    """已读取完毕（或提前截断）的响应，连接已归还或关闭"""
+
+    status: int
+    url: str
+    headers: Mapping[str, str]
+    body: bytes
+    encoding: str
+    complete: bool = True
+    raw: Any = field(default=None, repr=False, compare=False)
+
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors="replace")
+
+    def raise_for_status(self) -> None:
+        if self.raw is not None:
+            self.raw.raise_for_status()
+
+
+PageKind = Literal["ok", "captcha", "security-check", "cloudflare", "not-found"]
+
+
+@dataclass(frozen=True)
+class BookPage:
+    """详情页抓取结果；complete 为 False 表示流式读取在关键标记后提前结束。
+
+    validator 为轮询响应带回的 (ETag, Last-Modified, 字节数)，页面解析成功后
+    再交给 ``AsyncCiweimaoClient.remember_validators`` 保存。
+    """
+
+    book_id: int
+    html: str
+    complete: bool = True
+    digest: str = ""
+    validator: tuple[str, str, int] | None = None
+
+    @cached_property
+    def kind(self) -> PageKind:
+        """页面类型，首次访问时才扫描页面"""
+        return classify_page(self.html)
+
+
+@dataclass(frozen=True)
+class CatalogPage:
+    """章节目录抓取结果；complete 为 False 表示 Range 请求只拿到目录末尾一段"""
+
+    book_id: int
+    html: str
+    complete: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class ChapterEntry:
+    """目录中的一章"""
+
+    chapter_id: int
+    title: str
+
+
+@dataclass(frozen=True)
+class UpdateProbe:
+    """不建 DOM 从详情页取出的更新检测字段，取值规则与完整解析一致"""
+
+    title: str
+    chapter: str
+    update_time: int
+
+
+class BlockedPageError(RuntimeError):
+    """站点返回了验证页面或不存在页面，而不是书籍详情"""
+
+    def __init__(self, book_id: int, kind: PageKind):
+        super().__init__(f"站点返回了非详情页面：book_id={book_id} kind={kind}")
+        self.book_id = book_id
+        self.kind = kind
+
+
 def asia_shanghai_tz() -> tzinfo:
     if ZoneInfo is not None:
         try:
@@ -99,11 +314,52 @@ def extract_chapter_info(update_text: str) -> tuple[str, int]:
         chapter_part = re.sub(r"\s+", " ", chapter_part).strip()
         break
 
-    chapter_part = re.sub(r"^[\s/|:：-–—]+", "", chapter_part).strip()
-    chapter_part = re.sub(r"[\s/|:：-–—]+$", "", chapter_part).strip()
+    chapter_part = re.sub(r"^[\s/|:：\-–—]+", "", chapter_part).strip()
+    chapter_part = re.sub(r"[\s/|:：\-–—]+$", "", chapter_part).strip()
     return chapter_part, ts
 
 
+_META_CHARSET_RE = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?\s*([A-Za-z0-9_.:-]+)", re.IGNORECASE
+)
+_ENCODING_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030", "x-gbk": "gb18030"}
+
+
+def sniff_encoding(content_type: str | None, body: bytes) -> str:
+    """按 BOM、Content-Type 声明、页面前部 <meta charset> 的顺序确定编码。
+
+    都没有声明时按 UTF-8 处理，不对整页做字符集探测。
+    """
+    if body[:3] == codecs.BOM_UTF8:
+        return "utf-8-sig"
+    candidates: list[str] = []
+    if content_type:
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "charset":
+                candidates.append(value.strip().strip("\"'"))
+    match = _META_CHARSET_RE.search(body[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    for name in candidates:
+        name = _ENCODING_ALIASES.get(name.lower(), name.lower())
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def decode_html_bytes(body: bytes, content_type: str | None = None) -> str:
+    return body.decode(sniff_encoding(content_type, body), errors="replace")
+
+
+def _as_text(html_content: str | bytes) -> str:
+    if isinstance(html_content, (bytes, bytearray)):
+        return decode_html_bytes(bytes(html_content))
+    return html_content
+
+
 def safe_text(el: Any) -> str:
     if not el:
         return ""
@@ -113,10 +369,22 @@ def safe_text(el: Any) -> str:
         return str(el).strip()
 
 
-def abspath_url(url: str) -> str:
+def abspath_url(url: str, base_url: str = BASE_URL) -> str:
     if not url:
         return ""
-    return url if url.startswith("http") else urljoin(BASE_URL, url)
+    return url if url.startswith("http") else urljoin(base_url, url)
+
+
+_shared_session: requests.Session | None = None
+_shared_session_lock = threading.Lock()
+
+
+def _get_shared_session() -> requests.Session:
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = requests.Session()
+        return _shared_session
 
 
 def fetch_image_data_uri(
@@ -125,7 +393,7 @@ def fetch_image_data_uri(
     if not url:
         return None
 
-    sess = session or requests.Session()
+    sess = session or _get_shared_session()
     try:
         resp = sess.get(
             abspath_url(url), timeout=DEFAULT_TIMEOUT_S, headers=DEFAULT_HEADERS
@@ -173,88 +441,291 @@ def format_ts_cn(ts: int) -> str:
         return "未知时间"
 
 
-def parse_search_html_content(html_content: str) -> list[dict[str, str]]:
-    soup = BeautifulSoup(html_content, "html.parser")
-    novel_items = soup.select("li[data-book-id]")
-
-    results: list[dict[str, str]] = []
-    for item in novel_items:
-        title = ""
-        read_url = ""
-
-        title_a = item.select_one("p.tit a")
-        if title_a:
-            title = safe_text(title_a)
-            read_url = title_a.get("href", "") or ""
-
-        if not read_url:
-            cover_a = item.select_one("a.cover")
-            if cover_a:
-                read_url = cover_a.get("href", "") or ""
-
-        if not title:
-            title = safe_text(item.select_one("p.tit")) or "未知标题"
-
-        author = "未知作者"
-        update_time = "未知更新"
-
-        for paragraph in item.find_all("p"):
-            paragraph_text = safe_text(paragraph)
-            if "小说作者" in paragraph_text:
-                author_link = paragraph.find("a")
-                if author_link:
-                    author = safe_text(author_link) or author
-            elif "最近更新" in paragraph_text:
-                update_time = paragraph_text or update_time
-
-        description = safe_text(item.select_one("div.desc"))
-
-        results.append(
-            {
-                "title": title,
-                "author": author,
-                "update_time": update_time,
-                "description": description,
-                "read_url": abspath_url(read_url) or "未知链接",
-            }
-        )
+class ParserBackend:
+    """HTML 解析后端。解析函数只通过这些方法访问节点，换后端不改提取逻辑。"""
+
+    name = ""
+
+    def parse(self, html: str) -> Any:
+        raise NotImplementedError
+
+    def parse_partial(self, html: str, tags: Iterable[str], classes: re.Pattern) -> Any:
+        """只构建标签名在 ``tags`` 内且某个 class 匹配 ``classes`` 的子树。
+
+        不支持局部构建的后端直接解析整页，提取结果不受影响。
+        """
+        return self.parse(html)
+
+    def release(self, doc: Any) -> None:
+        """提取完成后立即释放文档树"""
+
+    def select(self, node: Any, css: str) -> list[Any]:
+        raise NotImplementedError
+
+    def select_one(self, node: Any, css: str) -> Any:
+        raise NotImplementedError
+
+    def text(self, node: Any) -> str:
+        """各文本片段去除首尾空白后以空格连接，与 ``safe_text`` 一致"""
+        raise NotImplementedError
+
+    def raw_text(self, node: Any) -> str:
+        """原样拼接的文本，不做空白处理"""
+        raise NotImplementedError
+
+    def attr(self, node: Any, name: str) -> str:
+        raise NotImplementedError
+
+
+class Bs4Backend(ParserBackend):
+    name = "bs4"
+
+    def parse(self, html: str) -> Any:
+        return BeautifulSoup(html, "html.parser")
+
+    def parse_partial(self, html: str, tags: Iterable[str], classes: re.Pattern) -> Any:
+        strainer = SoupStrainer(list(tags), attrs={"class": classes})
+        return BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+    def release(self, doc: Any) -> None:
+        # bs4 的节点互相引用，不拆开要等循环 GC 才能回收
+        doc.decompose()
+
+    def select(self, node: Any, css: str) -> list[Any]:
+        return node.select(css)
+
+    def select_one(self, node: Any, css: str) -> Any:
+        return node.select_one(css)
+
+    def text(self, node: Any) -> str:
+        return safe_text(node)
+
+    def raw_text(self, node: Any) -> str:
+        return node.get_text() if node is not None else ""
+
+    def attr(self, node: Any, name: str) -> str:
+        return (node.get(name) or "") if node is not None else ""
+
+
+class SelectolaxBackend(ParserBackend):
+    """基于 selectolax（lexbor）的后端，文本提取规则与 bs4 的 html.parser 对齐"""
+
+    name = "selectolax"
+    _SKIP_TEXT_PARENTS = frozenset({"script", "style", "template"})
+
+    def parse(self, html: str) -> Any:
+        return LexborHTMLParser(html)
+
+    def select(self, node: Any, css: str) -> list[Any]:
+        return node.css(css)
+
+    def select_one(self, node: Any, css: str) -> Any:
+        return node.css_first(css)
+
+    _PRESERVE_SPACE_PARENTS = frozenset({"pre", "textarea"})
+    _ASCII_SPACES = " \t\n\r\f"
+
+    def _strings(self, node: Any) -> Iterable[str]:
+        for child in node.traverse(include_text=True):
+            if child.tag != "-text":
+                continue
+            parent = child.parent.tag
+            if parent in self._SKIP_TEXT_PARENTS:
+                continue
+            text = child.text_content or ""
+            if (
+                text
+                and not text.strip(self._ASCII_SPACES)
+                and parent not in self._PRESERVE_SPACE_PARENTS
+            ):
+                # bs4 把只含 ASCII 空白的文本折叠成一个换行或空格
+                text = "\n" if "\n" in text else " "
+            yield text
+
+    def text(self, node: Any) -> str:
+        if node is None:
+            return ""
+        return " ".join(part for part in map(str.strip, self._strings(node)) if part)
+
+    def raw_text(self, node: Any) -> str:
+        return "".join(self._strings(node)) if node is not None else ""
+
+    def attr(self, node: Any, name: str) -> str:
+        return (node.attributes.get(name) or "") if node is not None else ""
+
+
+PARSER_BACKENDS: dict[str, ParserBackend] = {"bs4": Bs4Backend()}
+if LexborHTMLParser is not None:
+    PARSER_BACKENDS["selectolax"] = SelectolaxBackend()
+
+_default_parser_backend = "selectolax" if "selectolax" in PARSER_BACKENDS else "bs4"
+
+
+def set_default_parser_backend(name: str | None) -> str:
+    """设置默认解析后端；``auto`` 或空值时优先使用已安装的快速后端。
+
+    返回实际生效的后端名称，指定的后端未安装时回退到 bs4。
+    """
+    global _default_parser_backend
+    key = (name or "auto").strip().lower()
+    if key == "auto":
+        key = "selectolax" if "selectolax" in PARSER_BACKENDS else "bs4"
+    elif key not in PARSER_BACKENDS:
+        logger.warning("Parser backend %r is not available, falling back to bs4", name)
+        key = "bs4"
+    _default_parser_backend = key
+    return key
+
+
+def get_parser_backend(name: str | None = None) -> ParserBackend:
+    if name is None:
+        return PARSER_BACKENDS[_default_parser_backend]
+    try:
+        return PARSER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown parser backend: {name}") from None
+
+
+def parse_search_html_content(
+    html_content: str | bytes, *, backend: str | None = None
+) -> list[dict[str, str]]:
+    return [item.to_dict() for item in parse_search_items(html_content, backend=backend)]
 
-    return results
 
+def parse_search_items(
+    html_content: str | bytes,
+    *,
+    limit: int | None = None,
+    backend: str | None = None,
+) -> list[SearchItem]:
+    return list(iter_search_items(html_content, limit=limit, backend=backend))
 
-def parse_book_details_html_content(html_content: str) -> dict[str, Any] | None:
+
+_SEARCH_ITEM_RE = re.compile(r"<li\b[^>]*\sdata-book-id\b", re.IGNORECASE)
+
+
+def count_search_items(html_content: str | bytes) -> int:
+    """统计搜索结果条数，只扫描 ``<li data-book-id>`` 开始标签，不建文档树"""
+    return len(_SEARCH_ITEM_RE.findall(_as_text(html_content)))
+
+
+def iter_search_items(
+    html_content: str | bytes,
+    *,
+    limit: int | None = None,
+    backend: str | None = None,
+) -> Iterator[SearchItem]:
+    """逐条提取搜索结果，取满 ``limit`` 条即停止，后面的条目不再提取"""
+    if limit is not None and limit <= 0:
+        return
+    be = get_parser_backend(backend)
+    doc = be.parse(_as_text(html_content))
+    novel_items = be.select(doc, "li[data-book-id]")
+    if limit is not None:
+        novel_items = novel_items[:limit]
+
+    try:
+        for item in novel_items:
+            title = ""
+            read_url = ""
+
+            title_a = be.select_one(item, "p.tit a")
+            if title_a:
+                title = be.text(title_a)
+                read_url = be.attr(title_a, "href")
+
+            if not read_url:
+                cover_a = be.select_one(item, "a.cover")
+                if cover_a:
+                    read_url = be.attr(cover_a, "href")
+
+            if not title:
+                title = be.text(be.select_one(item, "p.tit")) or "未知标题"
+
+            author = "未知作者"
+            update_time = "未知更新"
+
+            for paragraph in be.select(item, "p"):
+                paragraph_text = be.text(paragraph)
+                if "小说作者" in paragraph_text:
+                    author_link = be.select_one(paragraph, "a")
+                    if author_link:
+                        author = be.text(author_link) or author
+                elif "最近更新" in paragraph_text:
+                    update_time = paragraph_text or update_time
+
+            description = be.text(be.select_one(item, "div.desc"))
+
+            yield SearchItem(
+                title=title,
+                author=author,
+                update_time=update_time,
+                description=description,
+                read_url=abspath_url(read_url) or "未知链接",
+            )
+    finally:
+        be.release(doc)
+
+
+# 详情页实际读取的区块；局部解析时只构建这些子树
+_DETAIL_TARGET_TAGS = ("div", "h1", "p")
+_DETAIL_TARGET_CLASSES = re.compile(
+    r"(?:^|\s)(?:breadcrumb|title|label-box|update-time|book-desc|cover|book-property"
+    r"|book-grade)(?:\s|$)"
+)
+
+
+def parse_book_details_html_content(
+    html_content: str | bytes, *, backend: str | None = None
+) -> dict[str, Any] | None:
+    details = parse_book_details(html_content, backend=backend)
+    return details.to_dict() if details is not None else None
+
+
+def parse_book_details(
+    html_content: str | bytes, *, backend: str | None = None
+) -> BookDetails | None:
     from astrbot.api import logger as plugin_logger
 
+    be = get_parser_backend(backend)
+    html_content = _as_text(html_content)
     html_len = len(html_content or "")
     CWM_CRAWLER_DEBUG and plugin_logger.debug(
-        "[cwm] Parse details page: start. html_len=%s", html_len
+        "[cwm] Parse details page: start. html_len=%s backend=%s", html_len, be.name
     )
 
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        # 调试模式需要整页来列出候选的更新时间文本
+        soup = (
+            be.parse(html_content)
+            if CWM_CRAWLER_DEBUG
+            else be.parse_partial(
+                html_content, _DETAIL_TARGET_TAGS, _DETAIL_TARGET_CLASSES
+            )
+        )
     except Exception as exc:
         logger.exception("Failed to parse HTML: %s", exc)
         CWM_CRAWLER_DEBUG and plugin_logger.debug(
-            "[cwm] Parse details page: BeautifulSoup failed: %s", exc
+            "[cwm] Parse details page: %s failed: %s", be.name, exc
         )
         return None
 
     works_name = ""
-    breadcrumb = soup.select_one("div.breadcrumb")
+    breadcrumb = be.select_one(soup, "div.breadcrumb")
     if breadcrumb:
-        works_name = safe_text(breadcrumb).split(">")[-1].strip()
+        works_name = be.text(breadcrumb).split(">")[-1].strip()
 
-    author_name = safe_text(soup.select_one("h1.title a"))
+    author_name = be.text(be.select_one(soup, "h1.title a"))
     tag_list = [
-        safe_text(tag) for tag in soup.select("p.label-box span") if safe_text(tag)
+        text for text in map(be.text, be.select(soup, "p.label-box span")) if text
     ]
 
     chapter_name = ""
     update_time = -1
     update_text = ""
-    update_el = soup.select_one("p.update-time")
+    update_el = be.select_one(soup, "p.update-time")
     if update_el:
-        update_text = safe_text(update_el)
+        update_text = be.text(update_el)
         chapter_name, update_time = extract_chapter_info(update_text)
 
     def _short(s: str, n: int = 160) -> str:
@@ -272,10 +743,10 @@ def parse_book_details_html_content(html_content: str) -> dict[str, Any] | None:
         update_time,
     )
 
-    if not update_el:
+    if CWM_CRAWLER_DEBUG and not update_el:
         candidates: list[str] = []
-        for el in soup.find_all(["p", "div", "span", "li"]):
-            text = safe_text(el)
+        for el in be.select(soup, "p, div, span, li"):
+            text = be.text(el)
             if not text:
                 continue
             if "最近更新" in text or "更新时间" in text:
@@ -293,38 +764,40 @@ def parse_book_details_html_content(html_content: str) -> dict[str, Any] | None:
             )
 
     brief_introduction = ""
-    desc_el = soup.select_one("div.book-desc")
+    desc_el = be.select_one(soup, "div.book-desc")
     if desc_el:
-        brief_introduction = desc_el.get_text().replace(" ", "")
+        brief_introduction = be.raw_text(desc_el).replace(" ", "")
 
-    cover_image = ""
-    cover_img = soup.select_one("div.cover.ly-fl img")
-    if cover_img and cover_img.get("src"):
-        cover_image = cover_img["src"]
+    cover_image = be.attr(be.select_one(soup, "div.cover.ly-fl img"), "src")
     if not cover_image:
-        all_images = soup.find_all("img")
+        # 少见的兜底路径：局部树里没有全部图片，回退到整页
+        full = be.parse(html_content) if not CWM_CRAWLER_DEBUG else soup
+        all_images = be.select(full, "img")
         if all_images:
-            cover_image = all_images[-1].get("src", "") or ""
+            cover_image = be.attr(all_images[-1], "src")
+        if full is not soup:
+            be.release(full)
 
-    data: dict[str, Any] = {}
-    prop_div = soup.select_one("div.book-property.clearfix")
+    data: dict[str, float | str] = {}
+    prop_div = be.select_one(soup, "div.book-property.clearfix")
     if prop_div:
-        for span in prop_div.find_all("span"):
-            text = safe_text(span).replace("：", ":")
+        for span in be.select(prop_div, "span"):
+            text = be.text(span).replace("：", ":")
             if ":" not in text:
                 continue
             key, val = [part.strip() for part in text.split(":", 1)]
             if key:
                 data[key] = cn_number_to_float(val)
 
-    data2: dict[str, Any] = {}
-    grade_p = soup.select_one("p.book-grade")
+    data2: dict[str, float | str] = {}
+    grade_p = be.select_one(soup, "p.book-grade")
     if grade_p:
-        values = [safe_text(node) for node in grade_p.find_all("b") if safe_text(node)]
+        values = [text for text in map(be.text, be.select(grade_p, "b")) if text]
         if len(values) >= 3:
             data2["总点击"] = cn_number_to_float(values[0])
             data2["总收藏"] = cn_number_to_float(values[1])
             data2["总字数"] = cn_number_to_float(values[2])
+    be.release(soup)
 
     CWM_CRAWLER_DEBUG and plugin_logger.debug(
         "[cwm] Parse details page: works=%s chapter=%s update_time=%s cover=%s data_keys=%s data2_keys=%s",
@@ -336,32 +809,301 @@ def parse_book_details_html_content(html_content: str) -> dict[str, Any] | None:
         list(data2.keys()),
     )
 
-    return {
-        "Works_Name": works_name,
-        "Author_Name": author_name,
-        "Tag_List": tag_list,
-        "Chapter_Name": chapter_name,
-        "Update_Time": update_time,
-        "Brief_Introduction": brief_introduction,
-        "Cover_Image": cover_image,
-        "data": data,
-        "data2": data2,
-    }
+    return BookDetails(
+        works_name=works_name,
+        author_name=author_name,
+        tag_list=tuple(tag_list),
+        chapter_name=chapter_name,
+        update_time=update_time,
+        brief_introduction=brief_introduction,
+        cover_image=cover_image,
+        properties=tuple(data.items()),
+        stats=tuple(data2.items()),
+    )
 
 
-class CiweimaoClient:
+_DETAIL_HEAD_RE = re.compile(
+    rb'class="[^"]*\bupdate-time\b[^"]*"[^>]*>.*?</p>', re.DOTALL | re.IGNORECASE
+)
+_DETAIL_TITLE_RE = re.compile(rb'<h1[^>]*class="[^"]*\btitle\b', re.IGNORECASE)
+# 对应 parse_book_details 的 div.cover.ly-fl img，并要求 img 的 src 已完整到达；
+# 页面上推荐书籍的 a.cover、cover-wrap 等不算
+_DETAIL_COVER_RE = re.compile(
+    rb'<div\b[^>]*\bclass="(?=(?:[^"]*\s)?cover[\s"])(?=(?:[^"]*\s)?ly-fl[\s"])[^"]*"[^>]*>'
+    rb'\s*<img\b[^>]*\bsrc="[^"]*"',
+    re.IGNORECASE,
+)
+
+
+_PAGE_MARKER_RE = re.compile(
+    r"(?P<ok>update-time)"
+    # 只认挑战页特有的标记，正常页面引用 cdnjs.cloudflare.com 等资源不算
+    r"|(?P<cloudflare><title[^>]*>\s*Just a moment|cf-challenge|challenge-platform)"
+    r"|(?P<security>安全验证)"
+    r"|(?P<captcha>验证码)"
+    r"|(?P<missing>书籍不存在|作品不存在|页面不存在|<title[^>]*>[^<]*404 Not Found)",
+    re.IGNORECASE,
+)
+_PAGE_KIND_BY_GROUP: dict[str, PageKind] = {
+    "cloudflare": "cloudflare",
+    "security": "security-check",
+    "captcha": "captcha",
+    "missing": "not-found",
+}
+_PAGE_KIND_PRIORITY: tuple[PageKind, ...] = (
+    "cloudflare",
+    "security-check",
+    "captcha",
+    "not-found",
+)
+
+
+def classify_page(html: str) -> PageKind:
+    """单次扫描判断详情页是否为验证页或不存在页面。
+
+    遇到 update-time 即视为正常详情页并立即返回，页面里顺带出现的
+    “验证码”等字样不会误判。
+    """
+    found: set[PageKind] = set()
+    for match in _PAGE_MARKER_RE.finditer(html or ""):
+        group = match.lastgroup
+        if group == "ok":
+            return "ok"
+        found.add(_PAGE_KIND_BY_GROUP[group])
+    for kind in _PAGE_KIND_PRIORITY:
+        if kind in found:
+            return kind
+    return "ok"
+
+
+_PROBE_UPDATE_RE = re.compile(
+    r'<p\b[^>]*\bclass="[^"]*\bupdate-time\b[^"]*"[^>]*>(.*?)</p>',
+    re.IGNORECASE | re.DOTALL,
+)
+_PROBE_BREADCRUMB_RE = re.compile(
+    r'<div\b[^>]*\bclass="[^"]*\bbreadcrumb\b[^"]*"[^>]*>(.*?)</div>',
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _fragment_text(fragment: str) -> str:
+    text = htmllib.unescape(_TAG_RE.sub(" ", fragment))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def probe_book_update(html: str) -> UpdateProbe | None:
+    """用预编译正则读取 p.update-time 与面包屑书名，供更新检测判断是否需要完整解析。
+
+    找不到更新时间标记或时间无法解析时返回 None，调用方应回退到完整解析。
+    """
+    match = _PROBE_UPDATE_RE.search(html or "")
+    if not match:
+        return None
+    chapter, update_time = extract_chapter_info(_fragment_text(match.group(1)))
+    if update_time <= 0:
+        return None
+    title = ""
+    crumb = _PROBE_BREADCRUMB_RE.search(html)
+    if crumb:
+        title = _fragment_text(crumb.group(1)).split(">")[-1].strip()
+    return UpdateProbe(title=title, chapter=chapter, update_time=update_time)
+
+
+_CHAPTER_LINK_RE = re.compile(
+    r'<a\b[^>]*\bhref="[^"]*/chapter/(\d+)[^"]*"[^>]*>(.*?)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def parse_chapter_catalog(html: str) -> list[ChapterEntry]:
+    """按目录顺序提取章节链接，同一章节以最后一次出现的位置为准。
+
+    只匹配完整的 ``<a>`` 标签，也可用于 Range 请求拿到的目录末尾片段：
+    开头被截断的链接直接忽略。
+    """
+    entries: dict[int, ChapterEntry] = {}
+    for match in _CHAPTER_LINK_RE.finditer(html):
+        chapter_id = int(match.group(1))
+        # 页头的“最新章节”链接与目录重复，保留目录中的位置
+        entries.pop(chapter_id, None)
+        entries[chapter_id] = ChapterEntry(chapter_id, _fragment_text(match.group(2)))
+    return list(entries.values())
+
+
+def _page_title(html: str) -> str:
+    match = re.search(r"<title[^>]*>(.*?)</title>", html, flags=re.IGNORECASE | re.DOTALL)
+    return re.sub(r"\s+", " ", match.group(1)).strip()[:80] if match else ""
+
+
+def page_digest(body: bytes, complete: bool = True) -> str:
+    """原始响应字节的快速非加密哈希，用于判断页面是否与上次完全相同。
+
+    流式截断的页面长度取决于分块到达的时机，只对到 p.update-time 结束为止的
+    前缀取哈希，保证同一页面每次得到相同结果。
+    """
+    if not complete:
+        match = _DETAIL_HEAD_RE.search(body)
+        if match:
+            body = body[: match.end()]
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(body)
+    return f"{zlib.crc32(body):08x}-{len(body):x}"
+
+
+def has_detail_head(body: bytes) -> bool:
+    """详情页前部是否已包含更新检测所需的书名、封面与完整的 p.update-time"""
+    return bool(
+        _DETAIL_HEAD_RE.search(body)
+        and _DETAIL_TITLE_RE.search(body)
+        and _DETAIL_COVER_RE.search(body)
+    )
+
+
+class AsyncCiweimaoClient:
+    """基于 aiohttp 的异步客户端，所有请求共享同一个带 keep-alive 的连接池。
+
+    会话在首次请求时于当前事件循环中惰性创建，使用完毕需 ``await close()``。
+    幂等 GET 在网络错误、超时、429/5xx 时按指数退避重试；同一主机连续失败
+    达到阈值后熔断，冷却期内请求直接抛出 :class:`CircuitOpenError`。
+    """
+
     def __init__(
         self,
         *,
-        session: requests.Session | None = None,
         timeout_s: int = DEFAULT_TIMEOUT_S,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_per_host: int = DEFAULT_POOL_PER_HOST,
+        keepalive_s: float = DEFAULT_KEEPALIVE_S,
+        limiter: RateLimiter | None = None,
+        retries: int = DEFAULT_RETRIES,
+        retry_base_s: float = DEFAULT_RETRY_BASE_S,
+        retry_max_s: float = DEFAULT_RETRY_MAX_S,
+        breaker_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        breaker_cooldown_s: float = DEFAULT_BREAKER_COOLDOWN_S,
+        cover_cache: CoverCache | None = None,
+        base_url: str = BASE_URL,
     ):
-        self.session = session or requests.Session()
+        self.base_url = (base_url or BASE_URL).rstrip("/")
         self.timeout_s = int(timeout_s)
-        self.session.headers.update(DEFAULT_HEADERS)
+        self.pool_size = max(1, int(pool_size))
+        self.pool_per_host = max(1, int(pool_per_host))
+        self.keepalive_s = float(keepalive_s)
+        self.limiter = limiter or RateLimiter()
+        self.retries = max(0, int(retries))
+        self.retry_base_s = float(retry_base_s)
+        self.retry_max_s = float(retry_max_s)
+        self.breaker_threshold = int(breaker_threshold)
+        self.breaker_cooldown_s = float(breaker_cooldown_s)
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.cover_cache = cover_cache
+        self.retry_stats = {"retries": 0}
+        self._session: aiohttp.ClientSession | None = None
+        # book_id -> (ETag, Last-Modified, 上次响应体字节数)
+        self._validators: dict[int, tuple[str, str, int]] = {}
+        self.conditional_stats = {"requests": 0, "not_modified": 0, "bytes_saved": 0}
+        self.stream_stats = {"requests": 0, "truncated": 0, "bytes_read": 0}
+        self.catalog_stats = {"requests": 0, "tail": 0, "bytes_read": 0}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_per_host,
+                keepalive_timeout=self.keepalive_s,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).hostname or ""
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                threshold=self.breaker_threshold, cooldown_s=self.breaker_cooldown_s
+            )
+        return breaker
 
-    def search_name(self, name: str, page: int = 1) -> str:
-        url = f"{BASE_URL}/get-search-book-list/0-0-0-0-0-0/全部/{name}/{page}"
+    async def _request(
+        self,
+        endpoint: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        interactive: bool = True,
+        stop_when: Callable[[bytes], bool] | None = None,
+    ) -> HttpResponse:
+        """发送 GET 并读取响应体（304 不读取）。
+
+        传入 ``stop_when`` 时按块流式读取，每读一块用已收到的字节调用一次，
+        返回 True 即停止读取并关闭连接（结果 ``complete=False``）。
+        """
+        breaker = self._breaker_for(url)
+        # 熔断按逻辑请求计数：只在请求前检查一次，重试全部失败后才记一次失败
+        breaker.before_request()
+        attempt = 0
+        while True:
+            await self.limiter.acquire(endpoint, interactive=interactive)
+            session = await self._get_session()
+            try:
+                async with session.get(url, headers=headers or None) as raw:
+                    body = b""
+                    complete = True
+                    if raw.status == 304:
+                        pass
+                    elif stop_when is None or raw.status != 200:
+                        body = await raw.read()
+                    else:
+                        buf = bytearray()
+                        async for chunk in raw.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            buf += chunk
+                            if stop_when(buf):
+                                complete = False
+                                # 未读完的连接不能复用，直接关闭
+                                raw.close()
+                                break
+                        body = bytes(buf)
+                    resp = HttpResponse(
+                        status=raw.status,
+                        url=str(raw.url),
+                        headers=raw.headers,
+                        body=body,
+                        encoding=sniff_encoding(raw.headers.get("Content-Type"), body),
+                        complete=complete,
+                        raw=raw,
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt >= self.retries:
+                    breaker.record_failure()
+                    raise
+            else:
+                if resp.status not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return resp
+                if attempt >= self.retries:
+                    breaker.record_failure()
+                    return resp
+            attempt += 1
+            self.retry_stats["retries"] += 1
+            await asyncio.sleep(
+                backoff_delay(attempt, base_s=self.retry_base_s, max_s=self.retry_max_s)
+            )
+
+    async def search_name(
+        self, name: str, page: int = 1, *, interactive: bool = True
+    ) -> str:
+        url = f"{self.base_url}/get-search-book-list/0-0-0-0-0-0/全部/{name}/{page}"
         from astrbot.api import logger as plugin_logger
 
         CWM_CRAWLER_DEBUG and plugin_logger.debug(
@@ -373,7 +1115,7 @@ class CiweimaoClient:
         )
         start_t = time.perf_counter()
         try:
-            resp = self.session.get(url, timeout=self.timeout_s)
+            resp = await self._request("search", url, interactive=interactive)
         except Exception as exc:
             elapsed_ms = int((time.perf_counter() - start_t) * 1000)
             CWM_CRAWLER_DEBUG and plugin_logger.debug(
@@ -386,38 +1128,106 @@ class CiweimaoClient:
             )
             raise
         elapsed_ms = int((time.perf_counter() - start_t) * 1000)
+        html_text = resp.text()
         content_type = (resp.headers.get("Content-Type") or "").split(";", 1)[0].strip()
-        try:
-            text_len = len(resp.text or "")
-        except Exception:
-            text_len = -1
-
         CWM_CRAWLER_DEBUG and plugin_logger.debug(
-            "[cwm] Search response: status=%s elapsed_ms=%s final_url=%s content_type=%s encoding=%s apparent_encoding=%s text_len=%s",
-            getattr(resp, "status_code", None),
+            "[cwm] Search response: status=%s elapsed_ms=%s final_url=%s content_type=%s encoding=%s text_len=%s",
+            resp.status,
             elapsed_ms,
-            getattr(resp, "url", None),
+            resp.url,
             content_type or "unknown",
-            getattr(resp, "encoding", None),
-            getattr(resp, "apparent_encoding", None),
-            text_len,
+            resp.encoding,
+            len(html_text),
         )
         resp.raise_for_status()
-        return resp.text
+        return html_text
 
-    def get_book_details(self, book_id: int) -> str:
-        url = f"{BASE_URL}/book/{int(book_id)}"
+    async def get_book_details(self, book_id: int, *, interactive: bool = True) -> str:
+        page = await self._fetch_book_page(book_id, interactive=interactive)
+        return page.html if page is not None else ""
+
+    async def poll_book_details(
+        self, book_id: int, *, stream: bool = True
+    ) -> BookPage | None:
+        """条件请求详情页：页面未变化（304）时返回 None，不读取也不解码响应体。
+
+        校验值（ETag / Last-Modified）只由本方法读写，避免普通指令的请求
+        刷新校验值后导致轮询错过更新。收到 200 时旧校验值立即作废，新校验值
+        随页面返回，调用方解析成功后调用 ``remember_validators`` 才会保存，
+        解析失败时下次轮询仍完整请求。``stream`` 为 True 时读到书名、封面与
+        ``p.update-time`` 后即停止下载，缺少这些标记时会读完整个页面。
+        """
+        bid = int(book_id)
+        validator = self._validators.get(bid)
+        headers: dict[str, str] = {}
+        if validator is not None:
+            etag, last_modified, _ = validator
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        if headers:
+            self.conditional_stats["requests"] += 1
+
+        page = await self._fetch_book_page(
+            bid,
+            headers=headers,
+            store_validators=True,
+            interactive=False,
+            stop_when=has_detail_head if stream else None,
+        )
+        if page is None and validator is not None:
+            self.conditional_stats["not_modified"] += 1
+            self.conditional_stats["bytes_saved"] += validator[2]
+        return page
+
+    def remember_validators(self, page: BookPage) -> None:
+        """保存已成功解析的轮询页面的校验值，供下次发送条件请求"""
+        if page.validator is not None:
+            self._validators[int(page.book_id)] = page.validator
+
+    def forget_validators(self, book_id: int) -> None:
+        self._validators.pop(int(book_id), None)
+
+    def prune_validators(self, keep_book_ids: Iterable[int]) -> None:
+        keep = {int(bid) for bid in keep_book_ids}
+        for bid in [bid for bid in self._validators if bid not in keep]:
+            del self._validators[bid]
+
+    def conditional_hit_rate(self) -> float:
+        requests_count = self.conditional_stats["requests"]
+        if requests_count <= 0:
+            return 0.0
+        return self.conditional_stats["not_modified"] / requests_count
+
+    async def _fetch_book_page(
+        self,
+        book_id: int,
+        *,
+        headers: Mapping[str, str] | None = None,
+        store_validators: bool = False,
+        interactive: bool = True,
+        stop_when: Callable[[bytes], bool] | None = None,
+    ) -> BookPage | None:
+        url = f"{self.base_url}/book/{int(book_id)}"
         from astrbot.api import logger as plugin_logger
 
         CWM_CRAWLER_DEBUG and plugin_logger.debug(
-            "[cwm] Request details page: book_id=%s url=%s timeout=%ss",
+            "[cwm] Request details page: book_id=%s url=%s timeout=%ss conditional=%s",
             int(book_id),
             url,
             self.timeout_s,
+            bool(headers),
         )
         start_t = time.perf_counter()
         try:
-            resp = self.session.get(url, timeout=self.timeout_s)
+            resp = await self._request(
+                "details",
+                url,
+                headers=headers,
+                interactive=interactive,
+                stop_when=stop_when,
+            )
         except Exception as exc:
             elapsed_ms = int((time.perf_counter() - start_t) * 1000)
             CWM_CRAWLER_DEBUG and plugin_logger.debug(
@@ -429,45 +1239,214 @@ class CiweimaoClient:
             )
             raise
         elapsed_ms = int((time.perf_counter() - start_t) * 1000)
-        content_type = (resp.headers.get("Content-Type") or "").split(";", 1)[0].strip()
-        final_url = getattr(resp, "url", None)
-        is_redirected = bool(final_url and str(final_url) != str(url))
-
-        try:
-            html_text = resp.text or ""
-        except Exception:
-            html_text = ""
-
-        title = ""
-        if html_text:
-            match = re.search(
-                r"<title[^>]*>(.*?)</title>", html_text, flags=re.IGNORECASE | re.DOTALL
+        if resp.status == 304:
+            CWM_CRAWLER_DEBUG and plugin_logger.debug(
+                "[cwm] Details not modified: book_id=%s elapsed_ms=%s",
+                int(book_id),
+                elapsed_ms,
             )
-            if match:
-                title = re.sub(r"\s+", " ", match.group(1)).strip()[:80]
-
-        markers = {
-            "has_update_time": "update-time" in html_text if html_text else False,
-            "has_recent_update": "最近更新" in html_text if html_text else False,
-            "has_update_label": "更新时间" in html_text if html_text else False,
-            "has_captcha": "验证码" in html_text if html_text else False,
-            "has_security_check": "安全验证" in html_text if html_text else False,
-            "has_cloudflare": "cloudflare" in html_text.lower() if html_text else False,
-        }
-
+            return None
+
+        html_text = resp.text()
+        status = resp.status
+        if stop_when is not None and status == 200:
+            self.stream_stats["requests"] += 1
+            self.stream_stats["bytes_read"] += len(resp.body)
+            if not resp.complete:
+                self.stream_stats["truncated"] += 1
+        validator = None
+        if store_validators and status == 200:
+            self._validators.pop(int(book_id), None)
+            etag = resp.headers.get("ETag") or ""
+            last_modified = resp.headers.get("Last-Modified") or ""
+            if etag or last_modified:
+                content_length = resp.headers.get("Content-Length") or ""
+                validator = (
+                    etag,
+                    last_modified,
+                    int(content_length) if content_length.isdigit() else len(resp.body),
+                )
+        final_url = resp.url
+        content_type = (resp.headers.get("Content-Type") or "").split(";", 1)[0].strip()
+        is_redirected = bool(final_url and final_url != url)
+
+        page = BookPage(
+            book_id=int(book_id),
+            html=html_text,
+            complete=resp.complete,
+            digest=page_digest(resp.body, resp.complete),
+            validator=validator,
+        )
         CWM_CRAWLER_DEBUG and plugin_logger.debug(
-            "[cwm] Details response: book_id=%s status=%s elapsed_ms=%s redirected=%s final_url=%s content_type=%s encoding=%s apparent_encoding=%s text_len=%s title=%s markers=%s",
+            "[cwm] Details response: book_id=%s status=%s elapsed_ms=%s redirected=%s final_url=%s content_type=%s encoding=%s text_len=%s complete=%s title=%s kind=%s",
             int(book_id),
-            getattr(resp, "status_code", None),
+            status,
             elapsed_ms,
             is_redirected,
             final_url,
             content_type or "unknown",
-            getattr(resp, "encoding", None),
-            getattr(resp, "apparent_encoding", None),
+            resp.encoding,
             len(html_text),
-            title or "unknown",
-            markers,
+            resp.complete,
+            _page_title(html_text) or "unknown",
+            page.kind,
         )
         resp.raise_for_status()
-        return html_text
+        return page
+
+    async def fetch_chapter_catalog(
+        self, book_id: int, *, tail_bytes: int = 0, interactive: bool = True
+    ) -> CatalogPage:
+        """抓取章节目录页。
+
+        ``tail_bytes`` 大于 0 时用 ``Range: bytes=-N`` 只请求目录末尾；站点不支持
+        Range 时照常返回整页。返回的 ``complete`` 表示是否拿到了完整目录。
+        """
+        url = f"{self.base_url}/chapter-list/{int(book_id)}/book_detail"
+        headers = {"Range": f"bytes=-{int(tail_bytes)}"} if tail_bytes > 0 else None
+        from astrbot.api import logger as plugin_logger
+
+        start_t = time.perf_counter()
+        resp = await self._request(
+            "details", url, headers=headers, interactive=interactive
+        )
+        resp.raise_for_status()
+        # 末尾范围覆盖整个目录时，站点也可能回 206
+        complete = resp.status != 206 or (
+            resp.headers.get("Content-Range") or ""
+        ).startswith("bytes 0-")
+        self.catalog_stats["requests"] += 1
+        self.catalog_stats["bytes_read"] += len(resp.body)
+        if not complete:
+            self.catalog_stats["tail"] += 1
+        CWM_CRAWLER_DEBUG and plugin_logger.debug(
+            "[cwm] Catalog response: book_id=%s status=%s elapsed_ms=%s bytes=%s complete=%s",
+            int(book_id),
+            resp.status,
+            int((time.perf_counter() - start_t) * 1000),
+            len(resp.body),
+            complete,
+        )
+        return CatalogPage(book_id=int(book_id), html=resp.text(), complete=complete)
+
+    async def fetch_image_data_uri(
+        self, url: str, *, interactive: bool = True
+    ) -> str | None:
+        if not url:
+            return None
+
+        full_url = abspath_url(url, self.base_url)
+        cache = self.cover_cache
+        cached: CoverEntry | None = None
+        if cache is not None:
+            cached = cache.peek(full_url) or await asyncio.to_thread(
+                cache.lookup, full_url
+            )
+            if cached is not None and cached.fresh:
+                return cached.data_uri
+
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            resp = await self._request(
+                "cover", full_url, headers=headers, interactive=interactive
+            )
+            if resp.status == 304 and cache is not None and cached is not None:
+                cache.mark_checked(full_url)
+                return cached.data_uri
+            resp.raise_for_status()
+            body = resp.body
+            content_type = (
+                (resp.headers.get("Content-Type") or "image/jpeg")
+                .split(";", 1)[0]
+                .strip()
+            )
+            if cache is not None:
+                return await asyncio.to_thread(
+                    cache.store,
+                    full_url,
+                    body,
+                    content_type,
+                    etag=resp.headers.get("ETag") or "",
+                    last_modified=resp.headers.get("Last-Modified") or "",
+                )
+            b64 = base64.b64encode(body).decode("ascii")
+            return f"data:{content_type};base64,{b64}"
+        except Exception as exc:
+            logger.debug(
+                "Failed to download cover image, fallback to %s: %s (%s)",
+                "stale cache" if cached is not None else "placeholder",
+                url,
+                exc,
+            )
+            return cached.data_uri if cached is not None else None
+
+
+class CiweimaoClient:
+    """同步包装：在私有后台事件循环中驱动 :class:`AsyncCiweimaoClient`。
+
+    ``session`` 参数与 ``.session`` 属性仅为兼容旧代码保留，请求已改由内部的
+    aiohttp 连接池发送，传入的 requests 会话不再使用。
+    """
+
+    def __init__(
+        self,
+        *,
+        session: requests.Session | None = None,
+        timeout_s: int = DEFAULT_TIMEOUT_S,
+        **pool_kwargs: Any,
+    ):
+        if session is not None:
+            warnings.warn(
+                "CiweimaoClient 的 session 参数已弃用且不再使用，请求由内部的 aiohttp 连接池发送",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        self.session = session or requests.Session()
+        self.aio = AsyncCiweimaoClient(timeout_s=timeout_s, **pool_kwargs)
+        self.timeout_s = self.aio.timeout_s
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="cwm-client-loop", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _call(self, coro: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def search_name(self, name: str, page: int = 1) -> str:
+        return self._call(self.aio.search_name(name, page))
+
+    def get_book_details(self, book_id: int) -> str:
+        return self._call(self.aio.get_book_details(book_id))
+
+    def fetch_image_data_uri(self, url: str) -> str | None:
+        return self._call(self.aio.fetch_image_data_uri(url))
+
+    def close(self) -> None:
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.aio.close(), loop).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join()
+            loop.close()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class CpuOffloader:
+    """把解析、卡片 HTML 拼装等 CPU 密集的纯函数交给进程池执行。
+
+    ``workers`` 为 0 时退化为事件循环默认线程池。进程池在第一次调用时才创建，
+    使用 spawn 方式启动，避免在带线程的宿主进程里 fork。提交的函数必须是模块级
+    函数，参数与返回值必须可 pickle。进程池崩溃时本次调用改在线程池执行，
+    下次调用重新创建进程池。
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        *,
+        initializer: Callable[..., Any] | None = None,
+        initargs: tuple[Any, ...] = (),
+    ) -> None:
+        self.workers = max(0, int(workers))
+        self._initializer = initializer
+        self._initargs = initargs
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.stats = {"process": 0, "thread": 0, "broken": 0}
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer,
+                    initargs=self._initargs,
+                )
+            return self._pool
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        if self.workers > 0:
+            try:
+                result = await loop.run_in_executor(self._get_pool(), call)
+            except BrokenProcessPool as exc:
+                logger.warning("CPU worker pool broken, falling back to thread: %s", exc)
+                self.stats["broken"] += 1
+                self._discard_pool()
+            else:
+                self.stats["process"] += 1
+                return result
+        self.stats["thread"] += 1
+        return await loop.run_in_executor(None, call)
+
+    def _discard_pool(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        """关闭进程池，不等待尚未开始的任务"""
+        self._discard_pool()
@@ -0,0 +1,579 @@
+from __future__ import annotations
+
+import base64
+import functools
+import io
+import uuid
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageOps  # type: ignore
+except Exception as e:  # pragma: no cover
+    Image = None  # type: ignore[assignment]
+    _PIL_IMPORT_ERROR = e
+
+from .cards import calc_book_details_card_height, calc_search_card_height
+from .core import format_ts_cn
+
+# 常见发行版 / 系统自带的中文字体，按顺序取第一个存在的
+CJK_FONT_CANDIDATES = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJKsc-Regular.otf",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/wqy-microhei/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/STHeiti Medium.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+)
+CARD_BACKENDS = ("html", "pillow")
+# 修改 Pillow 卡片版式后递增，使渲染缓存中的旧图片失效
+RASTER_TEMPLATE_VERSION = 2
+_BOLD_VARIANTS = (("-Regular", "-Bold"), ("msyh.ttc", "msyhbd.ttc"))
+
+WHITE = (255, 255, 255)
+INK = (10, 10, 20)
+
+# 背景：(线性渐变色标, [(颜色, 不透明度, 中心 x/y 比例, 横向/纵向半径)])
+_SEARCH_BG = (
+    ((0x1B, 0x16, 0x36), (0x0D, 0x10, 0x26), (0x10, 0x1B, 0x2F)),
+    [
+        ((255, 120, 200), 0.45, (0.10, 0.10), (1200, 600)),
+        ((120, 180, 255), 0.45, (0.90, 0.20), (900, 500)),
+        ((170, 255, 210), 0.18, (0.50, 0.90), (1000, 700)),
+    ],
+)
+_DETAILS_BG = (
+    ((0x20, 0x14, 0x37), (0x0F, 0x10, 0x26), (0x0F, 0x1A, 0x33)),
+    [
+        ((255, 140, 210), 0.48, (0.15, 0.20), (980, 580)),
+        ((125, 190, 255), 0.46, (0.88, 0.30), (900, 640)),
+        ((180, 255, 215), 0.20, (0.55, 0.95), (900, 520)),
+    ],
+)
+_UPDATE_BG = (
+    ((0x11, 0x24, 0x3A), (0x0D, 0x14, 0x26), (0x0C, 0x1F, 0x2A)),
+    [
+        ((130, 255, 210), 0.38, (0.12, 0.16), (1100, 620)),
+        ((120, 170, 255), 0.42, (0.92, 0.24), (900, 560)),
+        ((255, 210, 120), 0.18, (0.55, 0.95), (1000, 700)),
+    ],
+)
+_PINK_BLUE = ((255, 120, 200), (120, 180, 255))
+_GOLD_PINK = ((255, 215, 120), (255, 120, 200))
+_MINT_BLUE = ((130, 255, 210), (120, 170, 255))
+
+
+def _require_pil() -> None:
+    if Image is None:  # pragma: no cover
+        err = globals().get("_PIL_IMPORT_ERROR")
+        raise RuntimeError(f"Missing dependency Pillow, unable to draw card: {err!s}")
+
+
+def pillow_available() -> bool:
+    return Image is not None
+
+
+def find_cjk_font(preferred: str = "") -> str:
+    """返回可用的中文字体路径：优先 ``preferred``，否则取候选列表中第一个存在的；
+    都不存在时返回空字符串
+    """
+    for path in (preferred, *CJK_FONT_CANDIDATES):
+        if path and Path(path).is_file():
+            return str(path)
+    return ""
+
+
+@functools.lru_cache(maxsize=64)
+def _font(path: str, size: int, bold: bool = False) -> Any:
+    if not path:
+        return ImageFont.load_default(size)
+    if bold:
+        for old, new in _BOLD_VARIANTS:
+            candidate = path.replace(old, new)
+            if candidate != path and Path(candidate).is_file():
+                path = candidate
+                break
+    # Noto Sans CJK 的 ttc 中简体中文为第 3 个字形集
+    index = 2 if "NotoSansCJK-" in path and path.endswith(".ttc") else 0
+    return ImageFont.truetype(path, size, index=index)
+
+
+def _fake_bold(font_path: str, size: int) -> int:
+    """找不到粗体字形文件时用描边加粗，小字号不描边以免糊成一团"""
+    if not font_path:
+        return 0
+    for old, new in _BOLD_VARIANTS:
+        candidate = font_path.replace(old, new)
+        if candidate != font_path and Path(candidate).is_file():
+            return 0
+    return 1 if size >= 18 else 0
+
+
+@functools.lru_cache(maxsize=4096)
+def _glyph(path: str, size: int, bold: bool, ch: str) -> tuple[Any, int, int, float]:
+    """单个字符的灰度字形、相对基线的左上偏移与步进宽度。
+
+    FreeType 光栅化是绘制中最耗时的部分，而卡片文字（中文尤甚）大量重复，
+    按字符缓存字形后每次绘制只剩粘贴。
+    """
+    font = _font(path, size, bold)
+    stroke = _fake_bold(path, size) if bold else 0
+    advance = font.getlength(ch)
+    left, top, right, bottom = font.getbbox(ch, anchor="ls", stroke_width=stroke)
+    if right <= left or bottom <= top:
+        return None, 0, 0, advance
+    mask = Image.new("L", (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).text(
+        (-left, -top),
+        ch,
+        font=font,
+        fill=255,
+        anchor="ls",
+        stroke_width=stroke,
+        stroke_fill=255,
+    )
+    return mask, left, top, advance
+
+
+@functools.lru_cache(maxsize=32)
+def _alpha_lut(alpha: int) -> list[int]:
+    return [v * alpha // 255 for v in range(256)]
+
+
+class _Canvas:
+    """在 RGB 底图上按 RGBA 颜色混合绘制的简单排版工具"""
+
+    def __init__(self, width: int, height: int, background: tuple, font_path: str):
+        self.image = _background(width, height, *background)
+        self.draw = ImageDraw.Draw(self.image, "RGBA")
+        self.font_path = font_path
+
+    def width_of(self, text: str, size: int, bold: bool = False) -> float:
+        path = self.font_path
+        return sum(_glyph(path, size, bold, ch)[3] for ch in text)
+
+    def wrap(
+        self, text: str, size: int, bold: bool, width: float, max_lines: int
+    ) -> list[str]:
+        """按字符折行，超出 ``max_lines`` 时最后一行以省略号结尾"""
+        text = " ".join(str(text).split())
+        lines: list[str] = []
+        line = ""
+        line_w = 0.0
+        truncated = False
+        for ch in text:
+            ch_w = self.width_of(ch, size, bold)
+            if line and line_w + ch_w > width:
+                lines.append(line)
+                if len(lines) == max_lines:
+                    truncated = True
+                    break
+                line, line_w = ch.lstrip(), self.width_of(ch.lstrip(), size, bold)
+                continue
+            line += ch
+            line_w += ch_w
+        if not truncated and line:
+            lines.append(line)
+        if truncated:
+            last = lines[-1]
+            ellipsis_w = self.width_of("…", size, bold)
+            while last and self.width_of(last, size, bold) + ellipsis_w > width:
+                last = last[:-1]
+            lines[-1] = last.rstrip() + "…"
+        return lines or [""]
+
+    def _draw_line(
+        self, x: float, baseline: float, line: str, size: int, bold: bool, fill: tuple, alpha: int
+    ) -> None:
+        glyphs = [_glyph(self.font_path, size, bold, ch) for ch in line]
+        if not glyphs:
+            return
+        # 先把整行字形拼进一张灰度遮罩，再一次性按颜色与不透明度贴到底图上
+        ascent, descent = _font(self.font_path, size, bold).getmetrics()
+        pad = 2
+        line_w = int(sum(g[3] for g in glyphs)) + 2 * pad + size
+        mask = Image.new("L", (line_w, ascent + descent + 2 * pad), 0)
+        pen = float(pad)
+        for glyph, left, top, advance in glyphs:
+            if glyph is not None:
+                mask.paste(glyph, (int(round(pen)) + left, pad + ascent + top), glyph)
+            pen += advance
+        if alpha < 255:
+            mask = mask.point(_alpha_lut(alpha))
+        self.image.paste(fill, (int(round(x)) - pad, int(round(baseline)) - ascent - pad), mask)
+
+    def text(
+        self,
+        xy: tuple[float, float],
+        text: str,
+        size: int,
+        *,
+        bold: bool = False,
+        fill: tuple = WHITE,
+        alpha: float = 0.92,
+        width: float | None = None,
+        max_lines: int = 1,
+        line_height: float = 1.25,
+        anchor: str = "la",
+    ) -> float:
+        """绘制（可折行的）文本，返回占用的高度。
+
+        ``anchor`` 与 Pillow 的含义相同，水平支持 l/m/r，垂直支持 a/m。
+        """
+        lines = (
+            self.wrap(text, size, bold, width, max_lines)
+            if width is not None
+            else [str(text)]
+        )
+        ascent, descent = _font(self.font_path, size, bold).getmetrics()
+        step = size * line_height
+        x, y = xy
+        if anchor[1] == "m":
+            y += (ascent - descent) / 2 - ascent - (step - size) / 2
+        for i, line in enumerate(lines):
+            line_x = x
+            if anchor[0] != "l":
+                line_w = self.width_of(line, size, bold)
+                line_x -= line_w if anchor[0] == "r" else line_w / 2
+            baseline = y + i * step + (step - size) / 2 + ascent
+            self._draw_line(line_x, baseline, line, size, bold, fill, int(255 * alpha))
+        return step * len(lines)
+
+    def panel(
+        self,
+        box: tuple[float, float, float, float],
+        radius: int,
+        *,
+        fill: tuple = (255, 255, 255, 30),
+        outline: tuple = (255, 255, 255, 36),
+    ) -> None:
+        self.draw.rounded_rectangle(box, radius, fill=fill, outline=outline, width=1)
+
+    def gradient_pill(
+        self,
+        box: tuple[float, float, float, float],
+        colors: tuple[tuple[int, int, int], tuple[int, int, int]],
+        radius: int | None = None,
+    ) -> None:
+        x0, y0, x1, y1 = (int(round(v)) for v in box)
+        w, h = max(1, x1 - x0), max(1, y1 - y0)
+        ramp = Image.linear_gradient("L").rotate(90).resize((w, h))
+        fill = Image.composite(
+            Image.new("RGB", (w, h), colors[1]), Image.new("RGB", (w, h), colors[0]), ramp
+        )
+        mask = Image.new("L", (w, h), 0)
+        ImageDraw.Draw(mask).rounded_rectangle(
+            (0, 0, w - 1, h - 1), h // 2 if radius is None else radius, fill=242
+        )
+        self.image.paste(fill, (x0, y0), mask)
+
+    def cover(
+        self, xy: tuple[int, int], size: tuple[int, int], data_uri: str, colors: tuple
+    ) -> None:
+        x, y = xy
+        w, h = size
+        cover = _decode_data_uri(data_uri)
+        mask = Image.new("L", (w, h), 0)
+        ImageDraw.Draw(mask).rounded_rectangle((0, 0, w - 1, h - 1), 20, fill=255)
+        if cover is not None:
+            self.image.paste(ImageOps.fit(cover, (w, h)), (x, y), mask)
+            self.draw.rounded_rectangle(
+                (x, y, x + w - 1, y + h - 1), 20, outline=(255, 255, 255, 46)
+            )
+            return
+        self.gradient_pill((x, y, x + w, y + h), colors, radius=20)
+        self.text(
+            (x + w / 2, y + h / 2), "无封面", 16, bold=True, fill=INK, anchor="mm"
+        )
+
+    def save(self, output_dir: str | Path, name: str) -> str:
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        path = out / f"{name}_{uuid.uuid4().hex}.png"
+        # 压缩级别低一些换取速度，卡片只在聊天里发送一次
+        self.image.save(path, format="PNG", compress_level=1)
+        return str(path)
+
+
+def _background(
+    width: int,
+    height: int,
+    stops: Sequence[tuple[int, int, int]],
+    blobs: Sequence[tuple],
+) -> Any:
+    # 背景只有平滑的渐变，在 1/4 尺寸上画好后整体放大，省去大图上的逐像素运算
+    scale = 4
+    sw, sh = max(2, width // scale), max(2, height // scale)
+    small = Image.new("L", (32, 32))
+    small.putdata([int((x / 31 + y / 31) / 2 * 255) for y in range(32) for x in range(32)])
+    ramp = small.resize((sw, sh), Image.BILINEAR)
+    mid = 0.42
+
+    def lut(channel: int) -> list[int]:
+        c0, c1, c2 = (stop[channel] for stop in stops)
+        out = []
+        for v in range(256):
+            t = v / 255
+            if t <= mid:
+                out.append(int(c0 + (c1 - c0) * t / mid))
+            else:
+                out.append(int(c1 + (c2 - c1) * (t - mid) / (1 - mid)))
+        return out
+
+    image = Image.merge("RGB", [ramp.point(lut(i)) for i in range(3)])
+    # 椭圆径向光斑，在半径 60% 处完全透明，与 HTML 版的 radial-gradient 一致
+    radial = Image.radial_gradient("L").crop((51, 51, 205, 205))
+    for color, opacity, (fx, fy), (rx, ry) in blobs:
+        w, h = max(1, int(rx * 1.2 / scale)), max(1, int(ry * 1.2 / scale))
+        mask = radial.resize((w, h), Image.BILINEAR).point(
+            lambda v, a=opacity: int(255 * a * max(0.0, 1 - v / 108.6))
+        )
+        image.paste(color, (int(sw * fx - w / 2), int(sh * fy - h / 2)), mask)
+    return image.resize((width, height), Image.BILINEAR)
+
+
+def _decode_data_uri(data_uri: str) -> Any:
+    if not data_uri or "," not in data_uri:
+        return None
+    try:
+        raw = base64.b64decode(data_uri.split(",", 1)[1])
+        return Image.open(io.BytesIO(raw)).convert("RGB")
+    except Exception:
+        return None
+
+
+def _card_frame(canvas: _Canvas, width: int, height: int) -> None:
+    canvas.panel((26, 26, width - 27, height - 27), 26, fill=(255, 255, 255, 26))
+
+
+def draw_search_card(
+    results: Iterable[Mapping[str, Any]],
+    *,
+    query: str | None = None,
+    max_items: int = 8,
+    total: int | None = None,
+    output_dir: str | Path = "./renders",
+    font_path: str = "",
+) -> str:
+    """用 Pillow 绘制搜索结果卡片，参数与 ``build_search_card_html`` 一致"""
+    _require_pil()
+    if total is None:
+        results = list(results)
+        total = len(results)
+    items = list(islice(results, max(1, int(max_items))))
+    total = max(int(total), len(items))
+    width = 1024
+    height = calc_search_card_height(len(items))
+    c = _Canvas(width, height, _SEARCH_BG, font_path)
+    _card_frame(c, width, height)
+
+    x0, x1, y = 48, width - 48, 48
+    c.text((x0, y), "刺猬猫 · 搜索结果", 34, bold=True, line_height=1.2)
+    c.text((x0, y + 47), f"共 {total} 条 · 展示前 {len(items)} 条", 13, alpha=0.85)
+    if query:
+        label = c.wrap(str(query), 16, True, 332, 1)[0]
+        badge_w = c.width_of(label, 16, True) + 28
+        c.gradient_pill((x1 - badge_w, y + 22, x1, y + 62), _PINK_BLUE)
+        c.text(
+            (x1 - badge_w / 2, y + 42), label, 16, bold=True, fill=INK, anchor="mm"
+        )
+
+    y += 64 + 14
+    item_h = 140
+    for idx, item in enumerate(items, start=1):
+        c.panel(
+            (x0, y, x1, y + item_h),
+            18,
+            fill=(255, 255, 255, 28),
+            outline=(255, 255, 255, 36),
+        )
+        c.gradient_pill((x0 + 16, y + 16, x0 + 54, y + 54), _GOLD_PINK)
+        c.text((x0 + 35, y + 35), str(idx), 16, bold=True, fill=INK, anchor="mm")
+        tx, tw = x0 + 68, x1 - x0 - 84
+        ty = y + 12
+        ty += c.text((tx, ty), item.get("title", ""), 19, bold=True, width=tw)
+        ty += 3 + c.text(
+            (tx, ty + 3),
+            f"作者：{item.get('author', '')} · {item.get('update_time', '')}",
+            13,
+            alpha=0.88,
+            width=tw,
+        )
+        desc = str(item.get("description", "") or "")
+        ty += 5 + c.text(
+            (tx, ty + 5),
+            desc or "(No description)",
+            13,
+            alpha=0.85 if desc else 0.62,
+            width=tw,
+            max_lines=2,
+            line_height=1.35,
+        )
+        c.text(
+            (tx, ty + 5), item.get("read_url", ""), 12, alpha=0.75, width=tw
+        )
+        y += item_h + 12
+
+    c.text((x1, height - 26 - 18 - 16), "Getcwm / Pillow", 12, alpha=0.7, anchor="ra")
+    return c.save(output_dir, "search")
+
+
+def draw_book_details_card(
+    details: Mapping[str, Any],
+    *,
+    cover_data_uri: str = "",
+    output_dir: str | Path = "./renders",
+    font_path: str = "",
+) -> str:
+    """用 Pillow 绘制书籍详情卡片，参数与 ``build_book_details_card_html`` 一致"""
+    _require_pil()
+    works_name = details.get("Works_Name", "") or ""
+    author_name = details.get("Author_Name", "") or ""
+    tag_list = list(details.get("Tag_List", []) or [])[:10]
+    chapter_name = details.get("Chapter_Name", "") or ""
+    update_ts = int(details.get("Update_Time", -1) or -1)
+    stat_map = dict(details.get("data2", {}) or {})
+    prop_items = list(dict(details.get("data", {}) or {}).items())[:8]
+    intro = (details.get("Brief_Introduction", "") or "").strip() or "（无简介）"
+
+    width = 1024
+    height = calc_book_details_card_height(len(tag_list), len(prop_items))
+    c = _Canvas(width, height, _DETAILS_BG, font_path)
+    _card_frame(c, width, height)
+
+    x0, x1, y = 48, width - 48, 48
+    c.text((x0, y), "刺猬猫 · 书籍详情", 14, bold=True, alpha=0.88)
+    c.text(
+        (x1, y + 3),
+        f"更新时间：{format_ts_cn(update_ts)}",
+        12,
+        alpha=0.72,
+        anchor="ra",
+    )
+    y += 20 + 14
+    c.cover((x0, y), (220, 312), cover_data_uri, _PINK_BLUE)
+
+    rx = x0 + 220 + 18
+    rw = x1 - rx
+    ry = y
+    ry += c.text((rx, ry), works_name, 34, bold=True, width=rw, max_lines=2, line_height=1.18)
+    ry += 8 + c.text((rx, ry + 8), f"作者：{author_name}", 14, alpha=0.88, width=rw)
+
+    if tag_list:
+        ry += 10
+        tx = rx
+        for tag in tag_list:
+            label = c.wrap(str(tag), 12, True, 160, 1)[0]
+            tag_w = c.width_of(label, 12, True) + 20
+            if tx + tag_w > x1 and tx > rx:
+                tx = rx
+                ry += 27 + 8
+            c.gradient_pill((tx, ry, tx + tag_w, ry + 27), _GOLD_PINK)
+            c.text((tx + tag_w / 2, ry + 13.5), label, 12, bold=True, fill=INK, anchor="mm")
+            tx += tag_w + 8
+        ry += 27
+
+    ry += 14
+    col_w = (rw - 20) / 3
+    for i, key in enumerate(("总点击", "总收藏", "总字数")):
+        sx = rx + i * (col_w + 10)
+        c.panel((sx, ry, sx + col_w, ry + 64), 16)
+        c.text((sx + 12, ry + 12), key, 12, alpha=0.78)
+        c.text((sx + 12, ry + 32), str(stat_map.get(key, "")), 18, bold=True, width=col_w - 24)
+    ry += 64 + 12
+
+    chapter_lines = len(c.wrap(chapter_name, 14, True, rw - 28, 2))
+    box_h = 12 + 15 + 7 + chapter_lines * 18 + 12
+    c.panel((rx, ry, x1, ry + box_h), 18)
+    c.text((rx + 14, ry + 12), "最新章节", 12, alpha=0.78)
+    c.text(
+        (rx + 14, ry + 34), chapter_name, 14, bold=True, width=rw - 28, max_lines=2,
+        line_height=1.28,
+    )
+    ry += box_h
+
+    if prop_items:
+        ry += 12
+        col_w = (rw - 10) / 2
+        for i, (key, val) in enumerate(prop_items):
+            px = rx + (i % 2) * (col_w + 10)
+            py = ry + (i // 2) * (58 + 10)
+            c.panel((px, py, px + col_w, py + 58), 16, fill=(255, 255, 255, 20), outline=(255, 255, 255, 30))
+            c.text((px + 12, py + 10), str(key), 12, alpha=0.78, width=col_w - 24)
+            c.text((px + 12, py + 30), str(val), 14, bold=True, width=col_w - 24)
+        rows = (len(prop_items) + 1) // 2
+        ry += rows * 58 + (rows - 1) * 10
+
+    ry += 12
+    intro_lines = c.wrap(intro, 13, False, rw - 28, 4)
+    box_h = 12 + 15 + 7 + int(len(intro_lines) * 13 * 1.45) + 12
+    c.panel((rx, ry, x1, ry + box_h), 18, fill=(0, 0, 0, 56), outline=(255, 255, 255, 30))
+    c.text((rx + 14, ry + 12), "简介", 12, alpha=0.78)
+    c.text(
+        (rx + 14, ry + 34), intro, 13, alpha=0.9, width=rw - 28, max_lines=4,
+        line_height=1.45,
+    )
+    return c.save(output_dir, "book")
+
+
+def draw_subscribe_update_card(
+    details: Mapping[str, Any],
+    *,
+    book_id: int,
+    cover_data_uri: str = "",
+    output_dir: str | Path = "./renders",
+    font_path: str = "",
+) -> str:
+    """用 Pillow 绘制订阅更新卡片，参数与 ``build_subscribe_update_card_html`` 一致"""
+    _require_pil()
+    works_name = details.get("Works_Name", "") or f"书籍ID：{int(book_id)}"
+    author_name = details.get("Author_Name", "") or "未知作者"
+    chapter_name = details.get("Chapter_Name", "") or "未知章节"
+    update_ts = int(details.get("Update_Time", -1) or -1)
+    book_url = f"https://www.ciweimao.com/book/{int(book_id)}"
+
+    width, height = 1024, 520
+    c = _Canvas(width, height, _UPDATE_BG, font_path)
+    _card_frame(c, width, height)
+
+    x0, x1, y = 48, width - 48, 48
+    c.text((x0, y + 8), "刺猬猫 · 订阅更新", 14, bold=True, alpha=0.88)
+    brand_w = c.width_of("刺猬猫 · 订阅更新", 14, True)
+    c.gradient_pill((x0 + brand_w + 10, y, x0 + brand_w + 60, y + 30), _MINT_BLUE)
+    c.text((x0 + brand_w + 35, y + 15), "NEW", 12, bold=True, fill=INK, anchor="mm")
+    c.text((x1, y), f"更新于：{format_ts_cn(update_ts)}", 12, alpha=0.72, anchor="ra")
+    y += 30 + 14
+    c.cover((x0, y), (210, 300), cover_data_uri, _MINT_BLUE[::-1])
+
+    rx = x0 + 210 + 18
+    rw = x1 - rx
+    ry = y
+    ry += c.text((rx, ry), works_name, 34, bold=True, width=rw, max_lines=2, line_height=1.18)
+    ry += 8 + c.text(
+        (rx, ry + 8), f"作者：{author_name} · ID：{int(book_id)}", 14, alpha=0.88, width=rw
+    )
+
+    ry += 12
+    chapter_lines = len(c.wrap(chapter_name, 14, True, rw - 28, 3))
+    box_h = 12 + 15 + 7 + int(chapter_lines * 14 * 1.32) + 12
+    c.panel((rx, ry, x1, ry + box_h), 18)
+    c.text((rx + 14, ry + 12), "最新章节", 12, alpha=0.78)
+    c.text(
+        (rx + 14, ry + 34), chapter_name, 14, bold=True, width=rw - 28, max_lines=3,
+        line_height=1.32,
+    )
+    ry += box_h + 12
+
+    c.panel((rx, ry, x1, ry + 56), 16, fill=(0, 0, 0, 46), outline=(255, 255, 255, 30))
+    c.text((rx + 12, ry + 10), "直达链接", 12, alpha=0.75)
+    c.text((rx + 12, ry + 30), book_url, 12, alpha=0.88, width=rw - 24)
+
+    c.text((x1, height - 26 - 22 - 16), "Getcwm / Subscribe Push", 12, alpha=0.7, anchor="ra")
+    return c.save(output_dir, f"update_{int(book_id)}")
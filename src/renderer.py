@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import math
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .cards import CardHtml, render_card_html
+
+try:
+    from playwright.async_api import async_playwright  # type: ignore
+except Exception:  # pragma: no cover
+    async_playwright = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RENDER_BROWSERS = ("auto", "playwright", "html2image")
+DEFAULT_RECYCLE_AFTER = 200
+DEFAULT_RENDER_TIMEOUT_S = 30.0
+RENDER_LANES = ("interactive", "background")
+
+
+class RenderBusyError(RuntimeError):
+    """渲染排队过长，交互请求应直接改用文本"""
+
+
+@dataclass
+class _PageSlot:
+    context: Any
+    page: Any
+    renders: int = 0
+
+
+class RendererPool:
+    """常驻的卡片截图池，三种卡片共用。
+
+    安装了 playwright 时启动一个无头 Chromium，最多保持 ``size`` 个预热页面
+    轮流截图；每次取用前检查页面与浏览器是否存活，失效的页面丢弃重建，浏览器
+    断开则重新启动；页面累计截图 ``recycle_after`` 次后关闭重建，避免内存增长。
+    未安装 playwright 或浏览器启动失败时使用线程内复用的 Html2Image，并发同样
+    限制为 ``size``（该方式每次截图仍会启动一次 Chromium）。
+    浏览器在第一次渲染时才启动，``close()`` 关闭全部页面与浏览器。
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        *,
+        browser: str = "auto",
+        recycle_after: int = DEFAULT_RECYCLE_AFTER,
+        timeout_s: float = DEFAULT_RENDER_TIMEOUT_S,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.recycle_after = max(1, int(recycle_after))
+        self.timeout_s = float(timeout_s)
+        browser = str(browser or "auto").strip().lower()
+        if browser not in RENDER_BROWSERS:
+            logger.warning("Unknown render browser %r, using auto", browser)
+            browser = "auto"
+        if browser != "html2image" and async_playwright is None:
+            if browser == "playwright":
+                logger.warning("playwright is not installed, using html2image")
+            browser = "html2image"
+        self.backend = "html2image" if browser == "html2image" else "playwright"
+        self._sem = asyncio.Semaphore(self.size)
+        self._start_lock = asyncio.Lock()
+        self._idle: list[_PageSlot] = []
+        self._playwright: Any = None
+        self._browser: Any = None
+        self.stats = {
+            "renders": 0,
+            "failures": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+            "launches": 0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None
+
+    @property
+    def warm_pages(self) -> int:
+        return len(self._idle)
+
+    async def render(self, card: CardHtml, *, output_dir: str | Path) -> str:
+        """截图并返回 PNG 路径；失败抛出 RuntimeError"""
+        async with self._sem:
+            if self.backend == "playwright":
+                try:
+                    await self._ensure_browser()
+                except Exception as exc:
+                    logger.warning(
+                        "Headless browser launch failed, using html2image: %s", exc
+                    )
+                    self.backend = "html2image"
+            if self.backend == "html2image":
+                try:
+                    path = await asyncio.to_thread(
+                        render_card_html, card, output_dir=output_dir
+                    )
+                except Exception:
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["renders"] += 1
+                return path
+            return await self._render_page(card, Path(output_dir))
+
+    async def _render_page(self, card: CardHtml, output_dir: Path) -> str:
+        slot = await self._checkout()
+        path = output_dir / f"{card.name}_{uuid.uuid4().hex}.png"
+        timeout_ms = self.timeout_s * 1000
+        try:
+            await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
+            await slot.page.set_viewport_size(
+                {"width": card.width, "height": card.height}
+            )
+            await slot.page.set_content(card.html, wait_until="load", timeout=timeout_ms)
+            await slot.page.screenshot(path=str(path), timeout=timeout_ms)
+        except Exception as exc:
+            self.stats["failures"] += 1
+            await self._close_slot(slot)
+            raise RuntimeError(f"Headless browser render failed: {exc}") from exc
+        self.stats["renders"] += 1
+        slot.renders += 1
+        if slot.renders >= self.recycle_after:
+            self.stats["recycled"] += 1
+            await self._close_slot(slot)
+        else:
+            self._idle.append(slot)
+        return str(path)
+
+    def _healthy(self, slot: _PageSlot) -> bool:
+        try:
+            return bool(self._browser.is_connected()) and not slot.page.is_closed()
+        except Exception:
+            return False
+
+    async def _checkout(self) -> _PageSlot:
+        while self._idle:
+            slot = self._idle.pop()
+            if self._healthy(slot):
+                return slot
+            self.stats["unhealthy"] += 1
+            await self._close_slot(slot)
+        await self._ensure_browser()
+        context = await self._browser.new_context()
+        return _PageSlot(context=context, page=await context.new_page())
+
+    async def _ensure_browser(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            await self._shutdown()
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            except Exception:
+                await self._shutdown()
+                raise
+            self.stats["launches"] += 1
+
+    @staticmethod
+    async def _close_slot(slot: _PageSlot) -> None:
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+
+    async def _shutdown(self) -> None:
+        slots, self._idle = self._idle, []
+        for slot in slots:
+            await self._close_slot(slot)
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        """关闭全部页面与浏览器"""
+        async with self._start_lock:
+            await self._shutdown()
+
+
+class RenderScheduler:
+    """卡片渲染调度：最多 ``concurrency`` 个渲染同时进行，分交互与后台两条队列。
+
+    空出的名额总是先给排队中的交互渲染（指令触发），后台推送只在没有交互
+    渲染等待时执行；同一队列内先到先得。交互渲染预计等待超过 ``max_wait_s``
+    或前面已排了 ``max_depth`` 个交互渲染时抛出 RenderBusyError，让调用方
+    立即改用文本，后台渲染则总是排队等待。预计等待按最近渲染耗时的指数
+    平均估算。
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        *,
+        max_wait_s: float = 8.0,
+        max_depth: int = 10,
+        initial_estimate_s: float = 1.0,
+    ) -> None:
+        self.concurrency = max(1, int(concurrency))
+        self.max_wait_s = max(0.0, float(max_wait_s))
+        self.max_depth = max(0, int(max_depth))
+        self.avg_render_s = float(initial_estimate_s)
+        self._active = 0
+        self._queues: dict[str, collections.deque[asyncio.Future[None]]] = {
+            lane: collections.deque() for lane in RENDER_LANES
+        }
+        self.stats = {
+            lane: {"renders": 0, "waited": 0, "wait_s": 0.0, "max_wait_s": 0.0}
+            for lane in RENDER_LANES
+        }
+        self.stats["interactive"]["rejected"] = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def depth(self, lane: str) -> int:
+        return len(self._queues[lane])
+
+    def estimated_wait_s(self, interactive: bool = True) -> float:
+        """现在提交一个渲染需要等待的大致秒数"""
+        ahead = self.depth("interactive")
+        if not interactive:
+            ahead += self.depth("background")
+        if self._active < self.concurrency and not ahead:
+            return 0.0
+        # 排在前面的渲染与正在进行的渲染按并发数分批完成
+        return math.ceil((ahead + 1) / self.concurrency) * self.avg_render_s
+
+    async def run(
+        self,
+        func: Callable[..., Awaitable[T]],
+        /,
+        *args: Any,
+        interactive: bool = True,
+        **kwargs: Any,
+    ) -> T:
+        lane = "interactive" if interactive else "background"
+        if interactive and (
+            (self.max_depth and self.depth(lane) >= self.max_depth)
+            or (self.max_wait_s and self.estimated_wait_s() > self.max_wait_s)
+        ):
+            self.stats[lane]["rejected"] += 1
+            raise RenderBusyError(
+                f"render queue busy: {self.depth(lane)} waiting, "
+                f"~{self.estimated_wait_s():.1f}s"
+            )
+        await self._acquire(lane)
+        start = time.monotonic()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - start
+            self.avg_render_s += 0.2 * (elapsed - self.avg_render_s)
+            self.stats[lane]["renders"] += 1
+            self._release()
+
+    async def _acquire(self, lane: str) -> None:
+        # 交互渲染只需等前面的交互渲染；后台渲染要等两条队列都空
+        ahead = self.depth("interactive") + (
+            self.depth("background") if lane == "background" else 0
+        )
+        if self._active < self.concurrency and not ahead:
+            self._active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._queues[lane]
+        queue.append(waiter)
+        start = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 已分到名额但调用方被取消：把名额交给下一个
+                self._release()
+            else:
+                queue.remove(waiter)
+            raise
+        waited = time.monotonic() - start
+        stats = self.stats[lane]
+        stats["waited"] += 1
+        stats["wait_s"] += waited
+        stats["max_wait_s"] = max(stats["max_wait_s"], waited)
+
+    def _release(self) -> None:
+        self._active -= 1
+        for lane in RENDER_LANES:
+            queue = self._queues[lane]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    self._active += 1
+                    waiter.set_result(None)
+                    return
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+RENDER_KINDS = ("search", "book", "update")
+DEFAULT_GRACE_S = 120.0
+
+
+def render_kind(path: str | Path) -> str:
+    """由文件名前缀（``search_`` / ``book_`` / ``update_``）得到卡片类型"""
+    prefix = Path(path).name.split("_", 1)[0]
+    return prefix if prefix in RENDER_KINDS else "other"
+
+
+@dataclass(slots=True)
+class _RenderFile:
+    kind: str
+    size: int
+    created: float
+    used: float
+
+
+class RenderStore:
+    """renders 目录中卡片图片的生命周期管理。
+
+    每个文件在内存索引中记录类型、大小与创建 / 最近使用时间，按最近使用排序；
+    清理只查索引，不扫描目录（仅启动后 ``load()`` 扫描一次）。限制包括总大小
+    ``max_bytes``、最长保留时间 ``max_age_s`` 与按卡片类型的 ``quotas``（字节），
+    0 表示不限制。
+
+    正在发送的图片用 ``pinned()`` 钉住，清理时跳过；刚写入或刚使用过
+    ``grace_s`` 秒内的图片同样不删，覆盖从渲染完成到开始发送之间的空档。
+    方法会在线程池中调用，内部状态由锁保护。
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_bytes: int = 0,
+        max_age_s: float = 0,
+        quotas: Mapping[str, int] | None = None,
+        grace_s: float = DEFAULT_GRACE_S,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_age_s = max(0.0, float(max_age_s))
+        self.quotas = {k: int(v) for k, v in (quotas or {}).items() if int(v) > 0}
+        self.grace_s = max(0.0, float(grace_s))
+        self._files: OrderedDict[str, _RenderFile] = OrderedDict()
+        self._kind_bytes: dict[str, int] = {}
+        self._pins: dict[str, int] = {}
+        self._listeners: list[Callable[[str], None]] = []
+        self.total_bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {
+            "added": 0,
+            "expired": 0,
+            "evicted": 0,
+            "pinned_skips": 0,
+            "sweeps": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def kind_bytes(self, kind: str) -> int:
+        return self._kind_bytes.get(kind, 0)
+
+    def entries_in(self, directory: str | Path) -> list[tuple[str, int]]:
+        """索引中位于 ``directory`` 下的图片（路径，字节数），按最近使用排序"""
+        prefix = str(directory)
+        with self._lock:
+            return [
+                (key, entry.size)
+                for key, entry in self._files.items()
+                if str(Path(key).parent) == prefix
+            ]
+
+    def on_remove(self, listener: Callable[[str], None]) -> None:
+        """注册文件被删除时的回调（参数为路径字符串），在持有锁时调用"""
+        self._listeners.append(listener)
+
+    def load(self) -> int:
+        """扫描目录一次，把启动前留下的图片纳入索引，返回新纳入的文件数"""
+        found = []
+        for directory in (self.root, *(p for p in self._subdirs())):
+            try:
+                entries = list(directory.iterdir())
+            except OSError:
+                continue
+            for path in entries:
+                if path.suffix != ".png":
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, str(path), stat.st_size))
+        added = 0
+        with self._lock:
+            for mtime, key, size in sorted(found):
+                if key not in self._files:
+                    self._insert(key, size, mtime)
+                    added += 1
+            # 启动前留下的文件排在本次运行写入的文件之前，先被淘汰
+            for _, key, _ in sorted(found, reverse=True):
+                if key in self._files:
+                    self._files.move_to_end(key, last=False)
+        return added
+
+    def _subdirs(self) -> list[Path]:
+        try:
+            return [p for p in self.root.iterdir() if p.is_dir()]
+        except OSError:
+            return []
+
+    def add(self, path: str | Path) -> None:
+        """登记刚写入的图片，并按总大小与类型配额淘汰旧图片"""
+        key = str(path)
+        try:
+            size = Path(key).stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            self._forget(key)
+            self._insert(key, size, time.time())
+            self.stats["added"] += 1
+            self._enforce_limits(time.time())
+
+    def touch(self, path: str | Path) -> bool:
+        """标记图片被复用；不在索引中或文件已不存在时返回 False"""
+        key = str(path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None:
+                return False
+            if not Path(key).is_file():
+                self._forget(key)
+                return False
+            entry.used = time.time()
+            self._files.move_to_end(key)
+            return True
+
+    def discard(self, path: str | Path) -> bool:
+        """删除一张图片；被钉住时不删并返回 False"""
+        key = str(path)
+        with self._lock:
+            if self._pins.get(key):
+                self.stats["pinned_skips"] += 1
+                return False
+            self._remove(key)
+            return True
+
+    def is_pinned(self, path: str | Path) -> bool:
+        return bool(self._pins.get(str(path)))
+
+    @contextlib.contextmanager
+    def pinned(self, *paths: str | Path | None) -> Iterator[None]:
+        """发送期间钉住图片，``None`` 会被忽略"""
+        keys = [str(p) for p in paths if p]
+        with self._lock:
+            for key in keys:
+                self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                for key in keys:
+                    left = self._pins.get(key, 0) - 1
+                    if left > 0:
+                        self._pins[key] = left
+                    else:
+                        self._pins.pop(key, None)
+
+    def sweep(self) -> int:
+        """删除过期图片，再按配额与总大小淘汰，返回删除的文件数"""
+        now = time.time()
+        with self._lock:
+            self.stats["sweeps"] += 1
+            removed = 0
+            if self.max_age_s:
+                expired = [
+                    key
+                    for key, entry in self._files.items()
+                    if now - entry.created > self.max_age_s
+                ]
+                for key in expired:
+                    if self._removable(key, now):
+                        self._remove(key)
+                        self.stats["expired"] += 1
+                        removed += 1
+            return removed + self._enforce_limits(now)
+
+    def _removable(self, key: str, now: float) -> bool:
+        if self._pins.get(key):
+            self.stats["pinned_skips"] += 1
+            return False
+        return now - self._files[key].used >= self.grace_s
+
+    def _enforce_limits(self, now: float) -> int:
+        removed = 0
+        for kind, quota in self.quotas.items():
+            if self._kind_bytes.get(kind, 0) <= quota:
+                continue
+            for key in [k for k, e in self._files.items() if e.kind == kind]:
+                if self._kind_bytes.get(kind, 0) <= quota:
+                    break
+                if self._removable(key, now):
+                    self._remove(key)
+                    self.stats["evicted"] += 1
+                    removed += 1
+        if self.max_bytes and self.total_bytes > self.max_bytes:
+            for key in list(self._files):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if self._removable(key, now):
+                    self._remove(key)
+                    self.stats["evicted"] += 1
+                    removed += 1
+        return removed
+
+    def _insert(self, key: str, size: int, created: float) -> None:
+        entry = _RenderFile(render_kind(key), size, created, created)
+        self._files[key] = entry
+        self._kind_bytes[entry.kind] = self._kind_bytes.get(entry.kind, 0) + size
+        self.total_bytes += size
+
+    def _forget(self, key: str) -> None:
+        entry = self._files.pop(key, None)
+        if entry is not None:
+            self._kind_bytes[entry.kind] -= entry.size
+            self.total_bytes -= entry.size
+
+    def _remove(self, key: str) -> None:
+        self._forget(key)
+        try:
+            Path(key).unlink()
+        except OSError:
+            pass
+        for listener in self._listeners:
+            listener(key)
+
+
+class RenderCache:
+    """卡片渲染结果缓存：以卡片输入的哈希命名图片，输入相同时直接复用。
+
+    图片存放在 ``store.root / "cache"`` 下，由 RenderStore 统一管理，过期、
+    配额淘汰与发送中钉住对缓存图片同样生效。缓存自身另有总大小上限
+    ``max_bytes``，超出时按最近最少使用交给 store 删除。方法会在线程池中调用。
+    """
+
+    SUBDIR = "cache"
+
+    def __init__(self, store: RenderStore, *, max_bytes: int) -> None:
+        self.store = store
+        self.root = store.root / self.SUBDIR
+        self.max_bytes = max(1, int(max_bytes))
+        # 哈希 -> (路径, 字节数)，按最近使用排序
+        self._keys: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._paths: dict[str, str] = {}
+        self.total_bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        store.on_remove(self._on_store_remove)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def make_key(inputs: Any) -> str:
+        """卡片输入规范化（键排序、紧凑分隔）后的 SHA-256"""
+        raw = json.dumps(
+            inputs,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def load(self) -> None:
+        """从 store 的索引中找回上次运行留下的缓存图片（需先调用 ``store.load()``）"""
+        entries = self.store.entries_in(self.root)
+        with self._lock:
+            for path, size in entries:
+                digest = Path(path).stem.rsplit("_", 1)[-1]
+                if path not in self._paths and digest not in self._keys:
+                    self._add(digest, path, size)
+
+    # 调用 store 时不持有自身的锁：store 删除文件时会在持有它的锁时回调本类
+    def lookup(self, key: str) -> str | None:
+        with self._lock:
+            item = self._keys.get(key)
+        hit = item is not None and self.store.touch(item[0])
+        with self._lock:
+            if hit and key in self._keys:
+                self._keys.move_to_end(key)
+                self.stats["hits"] += 1
+                return item[0]
+            if item is not None:
+                self._drop(key)
+            self.stats["misses"] += 1
+            return None
+
+    def store_file(self, key: str, rendered: str | Path) -> str:
+        """把刚渲染出的图片移入缓存目录并返回新路径。
+
+        文件名保留原来的卡片名前缀（``update_123_<哈希>.png``），供 store 按类型统计。
+        """
+        rendered = Path(rendered)
+        name = rendered.stem.rsplit("_", 1)[0]
+        path = self.root / f"{name}_{key}.png"
+        self.root.mkdir(parents=True, exist_ok=True)
+        rendered.replace(path)
+        self.store.add(path)
+        with self._lock:
+            self._drop(key)
+            self._add(key, str(path), path.stat().st_size)
+            self.stats["stores"] += 1
+            victims = []
+            excess = self.total_bytes - self.max_bytes
+            for old, (old_path, size) in self._keys.items():
+                if excess <= 0 or old == key:
+                    break
+                victims.append(old_path)
+                excess -= size
+        for old_path in victims:
+            if self.store.discard(old_path):
+                with self._lock:
+                    self.stats["evictions"] += 1
+        return str(path)
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def _add(self, key: str, path: str, size: int) -> None:
+        self._keys[key] = (path, size)
+        self._paths[path] = key
+        self.total_bytes += size
+
+    def _drop(self, key: str) -> None:
+        item = self._keys.pop(key, None)
+        if item is not None:
+            self._paths.pop(item[0], None)
+            self.total_bytes -= item[1]
+
+    def _on_store_remove(self, path: str) -> None:
+        with self._lock:
+            key = self._paths.get(path)
+            if key is not None:
+                self._drop(key)
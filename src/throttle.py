@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Mapping
+
+DEFAULT_RATES: dict[str, float] = {"search": 1.0, "details": 3.0, "cover": 5.0}
+DEFAULT_GLOBAL_RATE = 5.0
+DEFAULT_BURST_S = 2.0
+DEFAULT_BACKGROUND_RESERVE = 0.25
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BASE_S = 0.5
+DEFAULT_RETRY_MAX_S = 4.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN_S = 60.0
+
+
+class TokenBucket:
+    """令牌桶。交互请求优先：有交互请求在等待时，后台请求让行；
+    后台请求也不能动用最后 ``reserve`` 个令牌。rate <= 0 表示不限速。
+    """
+
+    def __init__(self, rate: float, capacity: float, *, reserve: float = 0.0):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.reserve = min(max(0.0, float(reserve)), self.capacity - 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._interactive_waiting = 0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def level(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def acquire(self, *, interactive: bool = True) -> None:
+        if self.unlimited:
+            return
+        if interactive:
+            self._interactive_waiting += 1
+        try:
+            while True:
+                self._refill()
+                floor = 0.0 if interactive else self.reserve
+                yielding = not interactive and self._interactive_waiting > 0
+                if not yielding and self._tokens - 1.0 >= floor:
+                    self._tokens -= 1.0
+                    return
+                deficit = max(1.0 + floor - self._tokens, 1.0 if yielding else 0.0)
+                await asyncio.sleep(max(deficit / self.rate, 0.01))
+        finally:
+            if interactive:
+                self._interactive_waiting -= 1
+
+
+class RateLimiter:
+    """按接口分桶的限速器，另有一个所有接口共享的全局抓取预算桶。"""
+
+    def __init__(
+        self,
+        rates: Mapping[str, float] | None = None,
+        *,
+        global_rate: float = DEFAULT_GLOBAL_RATE,
+        burst_s: float = DEFAULT_BURST_S,
+        background_reserve: float = DEFAULT_BACKGROUND_RESERVE,
+    ):
+        merged = dict(DEFAULT_RATES)
+        merged.update(rates or {})
+
+        def make(rate: float) -> TokenBucket:
+            capacity = max(1.0, float(rate) * float(burst_s))
+            return TokenBucket(
+                rate, capacity, reserve=capacity * float(background_reserve)
+            )
+
+        self.buckets = {name: make(rate) for name, rate in merged.items()}
+        self.global_bucket = make(global_rate)
+
+    async def acquire(self, endpoint: str, *, interactive: bool = True) -> None:
+        bucket = self.buckets.get(endpoint)
+        if bucket is not None:
+            await bucket.acquire(interactive=interactive)
+        await self.global_bucket.acquire(interactive=interactive)
+
+    def levels(self) -> dict[str, tuple[float, float]]:
+        """各桶当前令牌数与容量，``"global"`` 为全局预算桶"""
+        out = {
+            name: (bucket.level(), bucket.capacity)
+            for name, bucket in self.buckets.items()
+            if not bucket.unlimited
+        }
+        if not self.global_bucket.unlimited:
+            out["global"] = (self.global_bucket.level(), self.global_bucket.capacity)
+        return out
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断器处于打开状态，请求被快速拒绝"""
+
+
+class CircuitBreaker:
+    """连续失败达到阈值后打开，冷却期内直接拒绝请求；
+    冷却结束后放行一个探测请求（半开），成功则关闭，失败则重新打开。
+    """
+
+    def __init__(self, *, threshold: int = 5, cooldown_s: float = 60.0):
+        self.threshold = max(1, int(threshold))
+        self.cooldown_s = max(0.0, float(cooldown_s))
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing_since: float | None = None
+        self.stats = {"rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown_s:
+            return "open"
+        return "half-open"
+
+    def before_request(self) -> None:
+        state = self.state
+        if state == "closed":
+            return
+        now = time.monotonic()
+        # 探测请求被取消等情况下不会回报结果，超过一个冷却期后允许新的探测
+        if state == "half-open" and (
+            self._probing_since is None or now - self._probing_since >= self.cooldown_s
+        ):
+            self._probing_since = now
+            return
+        self.stats["rejected"] += 1
+        remaining = 0.0
+        if self.opened_at is not None:
+            remaining = self.cooldown_s - (now - self.opened_at)
+        raise CircuitOpenError(f"站点暂时不可用，{max(0.0, remaining):.0f} 秒后重试")
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing_since = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        probing = self._probing_since is not None
+        if probing or self.failures >= self.threshold:
+            if self.opened_at is None or probing:
+                self.stats["opened"] += 1
+            self.opened_at = time.monotonic()
+            self._probing_since = None
+
+
+def backoff_delay(attempt: int, *, base_s: float, max_s: float) -> float:
+    """第 attempt 次重试前的等待时间（指数退避 + full jitter）"""
+    cap = min(float(max_s), float(base_s) * (2 ** max(0, int(attempt) - 1)))
+    return random.uniform(0.0, cap)